@@ -0,0 +1,129 @@
+"""
+DTO codec benchmark.
+
+Measures encode (DTO -> JSON) and decode (JSON -> DTO) time of game DTOs built from real game
+states: `dataclasses.asdict` with stdlib json versus DTO codec with the JSON backend in use.
+Game states are seeded, every measurement is repeated `--repeat` times after a warm-up and the
+median is reported.
+
+Run from backend folder:
+
+    python -m benchmarks.dto_codec --players 4 --rounds 5000 --repeat 7 --json-backend json
+"""
+import argparse
+import dataclasses
+import json
+import platform
+import random
+import statistics
+import time
+
+from typing import Any, Callable, Dict, List, Tuple
+
+from core.games.regicide.dto import GameStateDto, GameTurnDataDto, PlayerHand
+from core.games.regicide.game import Regicide
+from core.games.regicide.serializers import (
+    RegicideGameStateDataSerializer,
+    RegicideGameTurnDataSerializer,
+)
+from core.games.tictactoe.dto import GameStateDto as TicTacToeGameStateDto
+from core.games.tictactoe.game import TicTacToe
+from core.games.tictactoe.serializers import TicTacToeGameStateDataSerializer
+from core.resources import encoders
+from core.resources.encoders import json_dumps, json_loads
+from core.utils import Serializable
+
+
+def legacy_serialize(dto: Serializable) -> str:
+    """Serialize DTO the way it was done with `dataclasses.asdict`"""
+    data = dataclasses.asdict(dto)
+    data.pop("not_serializing", None)
+    return json.dumps(data, ensure_ascii=False)
+
+
+def legacy_deserialize(cls: Any, line: str) -> Serializable:
+    """Deserialize DTO the way it was done before"""
+    data = json.loads(line)
+    keys = {f.name for f in dataclasses.fields(cls)}
+    return cls(**{k: v for k, v in data.items() if k in keys})
+
+
+def get_dtos(players: int) -> Dict[str, Serializable]:
+    """Build DTOs of real game states"""
+    player_ids = [f"player-{index}" for index in range(players)]
+    regicide = Regicide.init_new_game(player_ids)
+    turn = RegicideGameTurnDataSerializer.dumps(regicide, player_id=player_ids[0])
+    tictactoe = TicTacToe.init_new_game(player_ids[:2])
+    for index in random.sample(range(9), 4):
+        tictactoe.make_turn(tictactoe.active_player.id, {"index": index})
+    return {
+        "regicide state": GameStateDto(**RegicideGameStateDataSerializer.dumps(regicide)),
+        "regicide turn": GameTurnDataDto(
+            **dict(turn, hands=[PlayerHand(**hand) for hand in turn["hands"]])
+        ),
+        "tictactoe state": TicTacToeGameStateDto(
+            **TicTacToeGameStateDataSerializer.dumps(tictactoe)
+        ),
+    }
+
+
+def measure(func: Callable[[], Any], rounds: int, repeat: int) -> float:
+    """Measure median of average time of function call over repeats, µs"""
+    for _ in range(rounds // 10):
+        func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        timings.append((time.perf_counter() - started) / rounds * 1_000_000)
+    return statistics.median(timings)
+
+
+def run(players: int, rounds: int, repeat: int, seed: int) -> List[Tuple[str, str, float, float]]:
+    """Run benchmark, return (dto, operation, legacy µs, codec µs) rows"""
+    # games shuffle decks with module level generator
+    random.seed(seed)
+    results = []
+    for name, dto in get_dtos(players).items():
+        cls = type(dto)
+        line = dto.serialize()
+        results.append(
+            (
+                name,
+                "encode",
+                measure(lambda: legacy_serialize(dto), rounds, repeat),
+                measure(lambda: json_dumps(dto.asdict()), rounds, repeat),
+            )
+        )
+        results.append(
+            (
+                name,
+                "decode",
+                measure(lambda: legacy_deserialize(cls, line), rounds, repeat),
+                measure(lambda: cls.fromdict(json_loads(line)), rounds, repeat),
+            )
+        )
+    return results
+
+
+def main(players: int, rounds: int, repeat: int, seed: int, backend: str) -> None:
+    """Run benchmark and print results"""
+    backend = encoders.set_json_backend(backend).name
+    print(f"JSON backend: {backend}, python: {platform.python_version()}, seed: {seed}")
+    print(f"{'dto':>16} {'op':>7} {'legacy, µs':>11} {'codec, µs':>10} {'speedup':>8}")
+    for name, operation, legacy, codec in run(players, rounds, repeat, seed):
+        print(f"{name:>16} {operation:>7} {legacy:>11.2f} {codec:>10.2f} {legacy / codec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--players", type=int, default=4, help="number of Regicide players")
+    parser.add_argument("--rounds", type=int, default=20000, help="number of calls per measurement")
+    parser.add_argument("--repeat", type=int, default=7, help="number of measurements")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--json-backend", default="auto", help="auto, orjson or json")
+    args = parser.parse_args()
+    main(args.players, args.rounds, args.repeat, args.seed, args.json_backend)
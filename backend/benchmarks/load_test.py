@@ -0,0 +1,375 @@
+"""
+End-to-end load test.
+
+Runs the application from `main.py` in-process against SQLite and in-memory stand-ins of Redis
+(pub/sub and cache), then drives simulated players through the HTTP API and room websockets:
+sign-up, login, room create / join, game start, turns and polls. Clients react to websocket
+messages the way frontend does: "refresh" (sent by server on room updates) makes every client
+fetch room data, state messages pushed after turns replace client's data. Room data is polled
+only if no state has been pushed for `--poll-timeout` seconds.
+
+Reports latency percentiles per route of `core/handlers/routes.py` and number of websocket
+messages per second received by clients. Clients share process and event loop with the server,
+so the numbers are rather an upper bound of latency for one server process.
+
+Run from backend folder (`.env` is read as by the server, server options could be passed too):
+
+    python -m benchmarks.load_test --players 1000 --table-size 2 --concurrency 50 --game Regicide
+
+Passwords are hashed with `--bcrypt-rounds` (4 by default) to keep sign-up of thousands of
+players fast, pass 12 to measure with production cost.
+"""
+import argparse
+import asyncio
+import functools
+import json
+import random
+import re
+import sys
+import time
+
+from collections import defaultdict
+from typing import Any, Dict, List, Pattern, Tuple
+
+import bcrypt
+
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.testing import bind_unused_port
+from tornado.websocket import WebSocketClientConnection, websocket_connect
+
+from benchmarks.poll_latency import percentile
+from benchmarks.ws_fanout import LocalPubSub
+from core.games.regicide.models import Card
+
+# status of started room
+STARTED = 1
+# regicide and tictactoe statuses of game in progress
+STATUSES_IN_PROGRESS = ("playing_cards", "discarding_cards", "in_progress")
+# used to shorten route patterns in report
+ID_PATTERN = "([a-zA-Z0-9_.-]+)"
+
+
+class LoadTestError(Exception):
+    """Unexpected response"""
+
+
+class Stats:
+    """Latencies of requests grouped by route"""
+
+    def __init__(self, routes: List[Tuple[str, Any]]) -> None:
+        """Init stats"""
+        self.routes: List[Tuple[Pattern, str]] = [
+            (re.compile(pattern), pattern.replace(ID_PATTERN, "{id}").rstrip("/?"))
+            for pattern, _ in routes
+        ]
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.messages = 0
+
+    def observe(self, method: str, path: str, seconds: float, failed: bool) -> None:
+        """Register request"""
+        route = next((name for pattern, name in self.routes if pattern.fullmatch(path)), path)
+        key = f"{method} {route}"
+        self.timings[key].append(seconds * 1000)
+        if failed:
+            self.errors[key] += 1
+
+    def report(self, duration: float) -> Dict[str, Any]:
+        """Percentiles (ms) per route"""
+        routes = {
+            key: dict(
+                count=len(timings),
+                errors=self.errors[key],
+                p50=round(percentile(timings, 50), 3),
+                p90=round(percentile(timings, 90), 3),
+                p99=round(percentile(timings, 99), 3),
+                max=round(max(timings), 3),
+            )
+            for key, timings in sorted(self.timings.items())
+        }
+        requests = sum(len(timings) for timings in self.timings.values())
+        return dict(
+            duration=round(duration, 3),
+            requests=requests,
+            requests_per_sec=round(requests / duration, 1),
+            ws_messages=self.messages,
+            ws_messages_per_sec=round(self.messages / duration, 1),
+            routes=routes,
+        )
+
+
+class Client:
+    """Simulated player"""
+
+    def __init__(self, base_url: str, stats: Stats, name: str, rng: random.Random) -> None:
+        """Init client"""
+        self.base_url = base_url
+        self.stats = stats
+        self.name = name
+        self.rng = rng
+        self.http = AsyncHTTPClient()
+        self.id = ""
+        self.token = ""
+        self.socket: WebSocketClientConnection | None = None
+        self.reader: asyncio.Task | None = None
+        self.room_id = ""
+        # the latest game state known to client
+        self.data: Dict[str, Any] | None = None
+        self.updated = asyncio.Event()
+
+    async def request(self, method: str, path: str, body: Any = None) -> Any:
+        """Send request to API, return decoded response"""
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = self.token
+        payload = json.dumps(body) if body is not None else ("" if method != "GET" else None)
+        started = time.perf_counter()
+        response = await self.http.fetch(
+            f"{self.base_url}{path}",
+            method=method,
+            headers=headers,
+            body=payload,
+            raise_error=False,
+        )
+        failed = response.code >= 400
+        self.stats.observe(method, path, time.perf_counter() - started, failed)
+        if failed:
+            raise LoadTestError(f"{method} {path}: {response.code} {response.body[:200]!r}")
+        return json.loads(response.body) if response.body else None
+
+    async def sign_up(self) -> None:
+        """Register and login"""
+        password = f"{self.name}-password"
+        await self.request(
+            "POST",
+            "/api/v1/auth/sign-up",
+            dict(username=self.name, email=f"{self.name}@load.test", password=password),
+        )
+        data = await self.request(
+            "POST", "/api/v1/auth/login", dict(name=self.name, password=password)
+        )
+        self.id, self.token = data["user_id"], data["token"]
+
+    async def connect(self, room_id: str) -> None:
+        """Open room websocket"""
+        self.room_id = room_id
+        url = f"{self.base_url.replace('http', 'ws', 1)}/api/v1/rooms/{room_id}/ws"
+        self.socket = await websocket_connect(url)
+        # as frontend does, authenticate to receive own game state view
+        await self.socket.write_message(json.dumps({"type": "auth", "token": self.token}))
+        self.reader = asyncio.create_task(self._read_messages())
+
+    async def close(self) -> None:
+        """Close websocket"""
+        if self.socket:
+            self.socket.close()
+        if self.reader:
+            await self.reader
+
+    async def refresh(self) -> None:
+        """Fetch room data"""
+        data = await self.request("GET", f"/api/v1/rooms/{self.room_id}/data")
+        self._update(data["data"])
+
+    async def _read_messages(self) -> None:
+        """Handle websocket messages"""
+        assert self.socket
+        while True:
+            message = await self.socket.read_message()
+            if message is None:
+                return
+            self.stats.messages += 1
+            if message == "refresh":
+                if self.data is None:
+                    # as room setup page does, check room has been started
+                    room = await self.request("GET", f"/api/v1/rooms/{self.room_id}")
+                    if room["data"]["status"] != STARTED:
+                        continue
+                await self.refresh()
+                continue
+            payload = json.loads(message)
+            if payload.get("type") == "state":
+                self._update(payload["data"])
+
+    def _update(self, data: Dict[str, Any]) -> None:
+        """Keep newer game state"""
+        if self.data is None or data.get("turn", 0) >= self.data.get("turn", 0):
+            self.data = data
+            self.updated.set()
+
+    async def play(self, max_turns: int, timeout: float) -> None:
+        """Make turns until game is over"""
+        played_turn = 0
+        while True:
+            try:
+                await asyncio.wait_for(self.updated.wait(), timeout)
+            except asyncio.TimeoutError:
+                # missed push, poll
+                await self.refresh()
+            self.updated.clear()
+            data = self.data
+            if not data or data["status"] not in STATUSES_IN_PROGRESS or data["turn"] > max_turns:
+                return
+            if data["active_player_id"] != self.id or data["turn"] <= played_turn:
+                continue
+            played_turn = data["turn"]
+            try:
+                await self.request(
+                    "POST", f"/api/v1/rooms/{self.room_id}/turn", self.choose_turn(data)
+                )
+            except LoadTestError:
+                # state has been changed meanwhile, wait for next one
+                continue
+
+    def choose_turn(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Choose valid turn for the game state"""
+        if "board" in data:
+            return {
+                "index": self.rng.choice([i for i, cell in enumerate(data["board"]) if not cell])
+            }
+        hand = next(hand["hand"] for hand in data["hands"] if hand["id"] == self.id) or []
+        if data["status"] == "playing_cards":
+            return {"cards": [self.rng.choice(hand)] if hand else []}
+        # discard the strongest cards until enemy attack is covered
+        cards, damage = [], data["enemy_state"][1]
+        for card in sorted(hand, key=lambda c: Card(c[0], c[1]).attack, reverse=True):
+            if damage <= 0:
+                break
+            cards.append(card)
+            damage -= Card(card[0], card[1]).attack
+        return {"cards": cards}
+
+
+async def play_table(
+    base_url: str, stats: Stats, game_id: str, names: List[str], rng: random.Random, args: Any
+) -> None:
+    """Players sign up, create a room, play a game"""
+    clients = [Client(base_url, stats, name, random.Random(rng.random())) for name in names]
+    await asyncio.gather(*(client.sign_up() for client in clients))
+    admin = clients[0]
+    room = await admin.request("POST", f"/api/v1/games/{game_id}/rooms", dict(size=len(clients)))
+    room_id = room["data"]["id"]
+    await admin.connect(room_id)
+    for client in clients[1:]:
+        await client.connect(room_id)
+        await client.request("POST", f"/api/v1/rooms/{room_id}/players", dict(user_id=client.id))
+    await admin.request("GET", f"/api/v1/rooms/{room_id}")
+    # server asks room sockets to refresh
+    await admin.request("PUT", f"/api/v1/rooms/{room_id}", dict(status=STARTED))
+    try:
+        await asyncio.gather(
+            *(client.play(args.max_turns, args.poll_timeout) for client in clients)
+        )
+    finally:
+        await asyncio.gather(*(client.close() for client in clients))
+
+
+async def run(args: Any) -> Dict[str, Any]:
+    """Start application and run load test"""
+    # application modules parse server options from command line when imported
+    from aiocache import caches
+    from tortoise import Tortoise
+
+    import main
+
+    from core.games.cache import game_state_cache
+    from core.handlers.routes import get_routes
+    from core.loaders import engine_registry
+    from core.resources.encoders import set_json_backend
+    from core.resources.models import Game
+    from core.websocket import WebSocketManager
+
+    caches.set_config(
+        {
+            "default": {"cache": "aiocache.SimpleMemoryCache"},
+            "local": {"cache": "aiocache.SimpleMemoryCache"},
+        }
+    )
+    bcrypt.gensalt = functools.partial(bcrypt.gensalt, args.bcrypt_rounds)
+    await Tortoise.init(db_url=args.db_url, modules={"models": ["core.resources.models"]})
+    await Tortoise.generate_schemas(safe=True)
+    for name in ("Regicide", "TicTacToe"):
+        await Game.get_or_create(name=name, defaults=dict(min_size=1, max_size=4))
+    game = await Game.get(name=args.game)
+    engine_registry.discover()
+    await engine_registry.load_games()
+    set_json_backend(main.options.json_backend)
+
+    pubsub = LocalPubSub()
+    await game_state_cache.listen(pubsub)
+    socket_manager = WebSocketManager(pubsub)
+    server = HTTPServer(main.Application(None, caches.get("default"), socket_manager))
+    sock, port = bind_unused_port()
+    server.add_sockets([sock])
+    AsyncHTTPClient.configure(None, max_clients=args.concurrency * args.table_size)
+
+    stats = Stats(get_routes())
+    rng = random.Random(args.seed)
+    tables = [
+        [f"load-{table}-{seat}" for seat in range(args.table_size)]
+        for table in range(args.players // args.table_size)
+    ]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def play(names: List[str]) -> None:
+        async with semaphore:
+            await play_table(f"http://127.0.0.1:{port}", stats, str(game.id), names, rng, args)
+
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(play(names) for names in tables), return_exceptions=True)
+    finally:
+        duration = time.perf_counter() - started
+        server.stop()
+        await socket_manager.close_all(timeout=1)
+        await Tortoise.close_connections()
+    report = stats.report(duration)
+    report["failed_tables"] = sum(isinstance(result, Exception) for result in results)
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print report as table"""
+    print(
+        f"{report['requests']} requests in {report['duration']:.1f}s "
+        f"({report['requests_per_sec']:.0f}/s), failed tables: {report['failed_tables']}"
+    )
+    print(
+        f"websocket messages: {report['ws_messages']} " f"({report['ws_messages_per_sec']:.0f}/s)"
+    )
+    print(
+        f"{'route':>42} {'count':>7} {'errors':>6} {'p50, ms':>8} {'p90, ms':>8} "
+        f"{'p99, ms':>8} {'max, ms':>8}"
+    )
+    for route, values in report["routes"].items():
+        print(
+            f"{route:>42} {values['count']:>7} {values['errors']:>6} {values['p50']:>8.2f} "
+            f"{values['p90']:>8.2f} {values['p99']:>8.2f} {values['max']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--players", type=int, default=200, help="number of simulated players")
+    parser.add_argument("--table-size", type=int, default=2, help="players per room")
+    parser.add_argument("--concurrency", type=int, default=20, help="rooms played at once")
+    parser.add_argument("--game", default="TicTacToe", choices=["Regicide", "TicTacToe"])
+    parser.add_argument("--max-turns", type=int, default=100, help="max turns per game")
+    parser.add_argument(
+        "--poll-timeout", type=float, default=1.0, help="seconds to wait for push before polling"
+    )
+    parser.add_argument("--bcrypt-rounds", type=int, default=4, help="password hashing cost")
+    parser.add_argument("--db-url", default="sqlite://:memory:", help="database url")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--json", action="store_true", help="print report as JSON")
+    args, server_args = parser.parse_known_args()
+    # the rest is parsed as server options
+    sys.argv = [sys.argv[0], *server_args]
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
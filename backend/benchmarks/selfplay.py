@@ -0,0 +1,229 @@
+"""
+Game self-play benchmark.
+
+Plays random but legal Regicide and TicTacToe games in-process. Every turn goes the way the
+engine handles it: game state is loaded from JSON, turn is made by `Game.make_turn` and new state
+is dumped back to JSON. Reports turns per second (`make_turn` only), serialize / deserialize time
+per turn and memory allocated per turn.
+
+Allocations are measured by `tracemalloc` in a separate pass over the same games (same seed), so
+tracing doesn't affect timings: `alloc_bytes_per_turn` is the average peak of memory allocated
+while making a turn, `alloc_blocks_per_turn` - average number of memory blocks a turn leaves
+allocated.
+
+Regicide turns are picked by `--regicide-picker`: `validator` (default) chooses among card
+combinations accepted by turn validation, `legal-moves` - among turns of the legal move
+generator, which lists only minimal discards. Games played by the two differ, so only reports of
+the same picker (`regicide_picker` field) are comparable.
+
+Run from backend folder:
+
+    python -m benchmarks.selfplay --games 1000 --seed 42 --json > baseline.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Type
+
+from core.games.game import Game
+from core.games.regicide.dto import GameStateDto as RegicideGameStateDto
+from core.games.regicide.game import Regicide, legal_moves, validate_game_turn
+from core.games.regicide.serializers import RegicideGameStateDataSerializer
+from core.games.regicide.utils import to_flat_hand
+from core.games.serializers import GameStateDataSerializer
+from core.games.tictactoe.dto import GameStateDto as TicTacToeGameStateDto
+from core.games.tictactoe.game import TicTacToe
+from core.games.tictactoe.serializers import TicTacToeGameStateDataSerializer
+from core.resources import encoders
+from core.resources.errors import Error
+from core.types import GameDataTurn
+from core.utils import Serializable
+
+# regicide combos have at most 4 cards (e.g. four twos)
+MAX_COMBO_SIZE = 4
+
+
+def random_regicide_turn(game: Regicide, rng: random.Random) -> GameDataTurn:
+    """Pick random valid turn of active player"""
+    player = game.active_player
+    hand = to_flat_hand(player.hand)
+    max_size = len(hand) if game.is_discarding_cards_state else min(len(hand), MAX_COMBO_SIZE)
+    turns = []
+    for size in range(1, max_size + 1):
+        for cards in itertools.combinations(hand, size):
+            turn = {"cards": list(cards)}
+            try:
+                validate_game_turn(game, player.id, turn)
+            except Error:
+                continue
+            turns.append(turn)
+    # skip playing cards only if there is nothing to play
+    return rng.choice(turns) if turns else {"cards": []}
+
+
+def random_legal_regicide_turn(game: Regicide, rng: random.Random) -> GameDataTurn:
+    """Pick random turn of active player among generated legal moves"""
+    # skip playing cards only if there is nothing to play
+    turns = [turn for turn in legal_moves(game, game.active_player.id) if turn["cards"]]
+    return rng.choice(turns) if turns else {"cards": []}
+
+
+REGICIDE_PICKERS: Dict[str, Callable[[Regicide, random.Random], GameDataTurn]] = {
+    "validator": random_regicide_turn,
+    "legal-moves": random_legal_regicide_turn,
+}
+
+
+def random_tictactoe_turn(game: TicTacToe, rng: random.Random) -> GameDataTurn:
+    """Pick random free cell"""
+    return {"index": rng.choice([index for index, cell in enumerate(game.board) if not cell])}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Game to play"""
+
+    game_cls: Type[Game]
+    serializer: GameStateDataSerializer
+    dto_cls: Type[Serializable]
+    random_turn: Callable[[Any, random.Random], GameDataTurn]
+    players: int
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "regicide": Scenario(
+        Regicide,
+        RegicideGameStateDataSerializer,  # type: ignore
+        RegicideGameStateDto,
+        random_regicide_turn,
+        players=2,
+    ),
+    "tictactoe": Scenario(
+        TicTacToe,
+        TicTacToeGameStateDataSerializer,  # type: ignore
+        TicTacToeGameStateDto,
+        random_tictactoe_turn,
+        players=2,
+    ),
+}
+
+
+def play(scenario: Scenario, games: int, seed: int, trace: bool = False) -> Dict[str, Any]:
+    """Play games, collect timings (or allocations if `trace`)"""
+    # games shuffle decks with module level generator
+    random.seed(seed)
+    rng = random.Random(seed)
+    turns = finished = 0
+    turn_time = dumps_time = loads_time = 0.0
+    alloc_bytes = alloc_blocks = 0
+    serializer = scenario.serializer
+    for index in range(games):
+        player_ids = [f"player-{index}-{number}" for number in range(scenario.players)]
+        data = encoders.json_dumps(serializer.dumps(scenario.game_cls.init_new_game(player_ids)))
+        while True:
+            started = time.perf_counter()
+            game = serializer.loads(scenario.dto_cls(**encoders.json_loads(data)))
+            loads_time += time.perf_counter() - started
+            if not game.is_game_in_progress:  # type: ignore[attr-defined]
+                finished += 1
+                break
+            turn = scenario.random_turn(game, rng)
+            player_id = game.active_player.id  # type: ignore[attr-defined]
+            if trace:
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                blocks = sys.getallocatedblocks()
+                game.make_turn(player_id, turn)
+                alloc_blocks += sys.getallocatedblocks() - blocks
+                alloc_bytes += tracemalloc.get_traced_memory()[1] - before
+            else:
+                started = time.perf_counter()
+                game.make_turn(player_id, turn)
+                turn_time += time.perf_counter() - started
+            started = time.perf_counter()
+            data = encoders.json_dumps(serializer.dumps(game))
+            dumps_time += time.perf_counter() - started
+            turns += 1
+    if trace:
+        return dict(
+            alloc_bytes_per_turn=round(alloc_bytes / turns, 1),
+            alloc_blocks_per_turn=round(alloc_blocks / turns, 2),
+        )
+    return dict(
+        games=games,
+        finished=finished,
+        turns=turns,
+        turns_per_sec=round(turns / turn_time),
+        serialize_us_per_turn=round(dumps_time / turns * 1_000_000, 2),
+        deserialize_us_per_turn=round(loads_time / turns * 1_000_000, 2),
+    )
+
+
+def run(names: List[str], games: int, seed: int, picker: str = "validator") -> Dict[str, Any]:
+    """Run benchmark for games"""
+    scenarios = dict(SCENARIOS)
+    scenarios["regicide"] = replace(scenarios["regicide"], random_turn=REGICIDE_PICKERS[picker])
+    results: Dict[str, Any] = {}
+    for name in names:
+        results[name] = play(scenarios[name], games, seed)
+        tracemalloc.start()
+        try:
+            results[name].update(play(scenarios[name], games, seed, trace=True))
+        finally:
+            tracemalloc.stop()
+    return dict(
+        seed=seed,
+        python=platform.python_version(),
+        json_backend=encoders.json_backend.name,
+        regicide_picker=picker,
+        results=results,
+    )
+
+
+def main(names: List[str], games: int, seed: int, picker: str, as_json: bool) -> None:
+    """Run benchmark and print report"""
+    report = run(names, games, seed, picker)
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return
+    print(
+        f"seed: {seed}, python: {report['python']}, JSON backend: {report['json_backend']}, "
+        f"regicide picker: {picker}"
+    )
+    print(
+        f"{'game':>10} {'turns':>8} {'turns/s':>9} {'ser, µs':>8} {'deser, µs':>10} "
+        f"{'alloc, B':>9} {'blocks':>7}"
+    )
+    for name, result in report["results"].items():
+        print(
+            f"{name:>10} {result['turns']:>8} {result['turns_per_sec']:>9} "
+            f"{result['serialize_us_per_turn']:>8.2f} {result['deserialize_us_per_turn']:>10.2f} "
+            f"{result['alloc_bytes_per_turn']:>9.0f} {result['alloc_blocks_per_turn']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--game", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument(
+        "--regicide-picker",
+        choices=sorted(REGICIDE_PICKERS),
+        default="validator",
+        help="how random Regicide turns are picked",
+    )
+    parser.add_argument("--json-backend", default="auto", help="auto, orjson or json")
+    parser.add_argument("--json", action="store_true", help="print report as JSON")
+    args = parser.parse_args()
+    encoders.set_json_backend(args.json_backend)
+    main(args.game, args.games, args.seed, args.regicide_picker, args.json)
@@ -0,0 +1,130 @@
+"""
+WebSocket fan-out benchmark.
+
+Broadcasts messages to a room with fast and slow (simulated) clients and measures broadcast
+latency: time from publishing a message until every fast client has received it. Bounded
+concurrent fan-out is compared with sequential writes to every socket.
+
+Run from backend folder:
+
+    python -m benchmarks.ws_fanout --clients 100 --slow 0 1 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from typing import Dict, List
+
+from tornado.websocket import WebSocketClosedError
+
+from benchmarks.poll_latency import percentile
+from core.websocket import WebSocketManager
+
+ROOM_ID = "room"
+
+
+class LocalPubSub:
+    """In-process stand-in of Redis pub/sub manager"""
+
+    def __init__(self) -> None:
+        self.handlers: Dict = {}
+
+    async def subscribe(self, channel: str, handler) -> None:
+        self.handlers[channel] = handler
+
+    async def unsubscribe(self, channel: str) -> None:
+        self.handlers.pop(channel, None)
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self.handlers[channel](channel, message)
+
+
+class Client:
+    """Simulated websocket client"""
+
+    def __init__(self, delay: float, received: Dict[str, int] | None = None) -> None:
+        self.delay = delay
+        self.received = received
+        self.user_id = None
+        self.closed = False
+
+    async def write_message(self, message: str) -> None:
+        if self.closed:
+            raise WebSocketClosedError
+        await asyncio.sleep(self.delay)
+        if self.received is not None:
+            self.received[message] = self.received.get(message, 0) + 1
+
+    def close(self, code: int | None = None, reason: str | None = None) -> None:
+        self.closed = True
+
+
+class SequentialWebSocketManager(WebSocketManager):
+    """Writes messages to every socket one by one"""
+
+    async def _send_to_room(self, room_id: str, data: str) -> None:
+        for socket in list(self.rooms.get(room_id, [])):
+            try:
+                await socket.write_message(data)
+            except WebSocketClosedError:
+                await self.remove_user_from_room(room_id, socket)
+
+
+async def measure(
+    manager_cls, clients: int, slow: int, messages: int, interval: float, slow_delay: float
+) -> List[float]:
+    """Measure latency (ms) of delivering messages to all fast clients"""
+    manager = manager_cls(LocalPubSub())
+    received: Dict[str, int] = {}
+    fast_clients = clients - slow
+    for index in range(clients):
+        client = Client(slow_delay, None) if index < slow else Client(0, received)
+        await manager.add_user_to_room(ROOM_ID, client)
+
+    timings = []
+    for index in range(messages):
+        message = str(index)
+        started = time.perf_counter()
+        # sequential fan-out blocks publisher (pub/sub reader) until all sockets are written
+        await manager.broadcast_to_room(ROOM_ID, message)
+        while received.get(message, 0) < fast_clients:
+            await asyncio.sleep(0)
+        timings.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+
+    for socket in list(manager.rooms.get(ROOM_ID, [])):
+        await manager.remove_user_from_room(ROOM_ID, socket)
+    return timings
+
+
+async def main(
+    clients: int, slow_list: List[int], messages: int, interval: float, slow_delay: float
+) -> None:
+    """Run benchmark"""
+    print(f"{'clients':>8} {'slow':>6} {'fan-out':>12} {'p50, ms':>10} {'p99, ms':>10}")
+    for slow in slow_list:
+        for name, manager_cls in (
+            ("sequential", SequentialWebSocketManager),
+            ("concurrent", WebSocketManager),
+        ):
+            timings = await measure(manager_cls, clients, slow, messages, interval, slow_delay)
+            print(
+                f"{clients:>8} {slow:>6} {name:>12} "
+                f"{statistics.median(timings):>10.3f} {percentile(timings, 99):>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--clients", type=int, default=100, help="number of clients in room")
+    parser.add_argument("--slow", nargs="+", type=int, default=[0, 1, 10])
+    parser.add_argument("--messages", type=int, default=100, help="number of broadcasts")
+    parser.add_argument("--interval", type=float, default=0.005, help="seconds between broadcasts")
+    parser.add_argument(
+        "--slow-delay", type=float, default=0.05, help="seconds slow client takes per message"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.slow, args.messages, args.interval, args.slow_delay))
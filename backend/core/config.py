@@ -8,17 +8,98 @@ from tornado.options import define, options, parse_command_line, parse_config_fi
 
 define("port", default=8888, help="run on the given port", type=int)
 define("debug", default=True, help="run in debug mode", type=bool)
+define("workers", default=1, help="number of server processes sharing the port", type=int)
+define(
+    "shutdown_timeout",
+    default=10.0,
+    help="max seconds to drain websockets and requests on shutdown",
+    type=float,
+)
 define("db_host", default="127.0.0.1", help="database host", type=str)
 define("db_port", default=5432, help="database port", type=int)
 define("db_database", default="bg_server_db", help="database name", type=str)
 define("db_user", default="", help="database user", type=str)
 define("db_password", default="", help="database password", type=str)
+define("db_pool_min_size", default=1, help="min number of db connections per worker", type=int)
+define("db_pool_max_size", default=10, help="max number of db connections per worker", type=int)
+define(
+    "db_pool_max_inactive_lifetime",
+    default=300.0,
+    help="seconds after which idle db connection is closed (0 - never)",
+    type=float,
+)
+define(
+    "db_pool_max_queries",
+    default=50000,
+    help="number of queries after which db connection is replaced with new one",
+    type=int,
+)
+define(
+    "db_statement_cache_size",
+    default=100,
+    help="number of prepared statements cached per db connection (0 - disable)",
+    type=int,
+)
+define(
+    "db_command_timeout",
+    default=0.0,
+    help="db query timeout in seconds (0 - no timeout)",
+    type=float,
+)
 define("redis_host", default="127.0.0.1", help="Redis cache host endpoint", type=str)
 define("redis_port", default=6379, help="Redis cache port", type=int)
 define("JWT_SECRET", default="some-jwt-secret", help="JWT secret token", type=str)
 define("JWT_ALGORITHM", default="HS256", help="JWT algorythm", type=str)
 define("JWT_EXP_DELTA_SECONDS", default=3000, help="JWT expiration time in seconds", type=int)
+define(
+    "player_cache_ttl",
+    default=30,
+    help="seconds authenticated player is cached in-process",
+    type=int,
+)
+define("password_workers", default=4, help="number of password hashing threads", type=int)
+define(
+    "password_queue_size",
+    default=64,
+    help="max number of queued password hashes, the next requests get 503 error",
+    type=int,
+)
+define("room_list_cache_ttl", default=5, help="seconds open rooms page is cached", type=int)
 define("TORTOISE_ORM", help="Tortoise ORM configuration", type=dict)
+define(
+    "game_turn_checkpoint_interval",
+    default=10,
+    help="store full game state every N turns and deltas in between (1 - always full state)",
+    type=int,
+)
+define("game_turn_retries", default=3, help="number of retries of conflicting turn", type=int)
+define(
+    "game_state_cache_size", default=1024, help="max number of cached games per worker", type=int
+)
+define(
+    "websocket_send_queue_size",
+    default=64,
+    help="max pending messages per websocket connection, slower clients are disconnected",
+    type=int,
+)
+define(
+    "websocket_room_sweep_interval",
+    default=30.0,
+    help="seconds between cleanups of rooms without connected websockets",
+    type=float,
+)
+define(
+    "pubsub_read_timeout",
+    default=1.0,
+    help="max seconds Redis pub/sub reader blocks waiting for a message (0 - forever)",
+    type=float,
+)
+define(
+    "json_backend",
+    default="auto",
+    help="JSON library for responses and game states: auto, orjson or json",
+    type=str,
+)
 
 
 ROOT_PATH = os.path.dirname(os.path.dirname(__file__))
@@ -66,6 +147,13 @@ TORTOISE_ORM = {
                 "password": options.db_password,
                 "port": options.db_port,
                 "user": options.db_user,
+                # asyncpg pool settings
+                "minsize": options.db_pool_min_size,
+                "maxsize": options.db_pool_max_size,
+                "max_inactive_connection_lifetime": options.db_pool_max_inactive_lifetime,
+                "max_queries": options.db_pool_max_queries,
+                "statement_cache_size": options.db_statement_cache_size,
+                "command_timeout": options.db_command_timeout or None,
             },
         }
     },
@@ -83,7 +171,11 @@ CACHE_CONFIG = {
             {"class": "aiocache.plugins.HitMissRatioPlugin"},
             {"class": "aiocache.plugins.TimingPlugin"},
         ],
-    }
+    },
+    # in-process cache of the worker
+    "local": {
+        "cache": "aiocache.SimpleMemoryCache",
+    },
 }
 
 caches.set_config(CACHE_CONFIG)
@@ -1,6 +1,11 @@
 """App constants"""
 import enum
 
+# default number of rooms per page
+ROOMS_PAGE_SIZE = 20
+# max number of rooms per page
+ROOMS_PAGE_MAX_SIZE = 100
+
 
 class GameRoomStatus(enum.Enum):
     """Represents current state of the game room"""
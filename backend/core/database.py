@@ -1,5 +1,5 @@
 """Setup database"""
-from tortoise import Tortoise
+from tortoise import Tortoise, connections
 
 from core.config import TORTOISE_ORM
 
@@ -7,3 +7,11 @@ from core.config import TORTOISE_ORM
 async def init_database() -> None:
     """Initialize database"""
     await Tortoise.init(config=TORTOISE_ORM)
+    await warm_up_database()
+
+
+async def warm_up_database() -> None:
+    """Open connection pools up front, so the first requests don't wait for connections"""
+    for connection in connections.all():
+        # pool is created lazily, with min number of connections
+        await connection.execute_query("SELECT 1")
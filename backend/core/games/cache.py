@@ -0,0 +1,87 @@
+"""Game state cache"""
+import logging
+
+from collections import OrderedDict
+from typing import Any, Tuple
+
+from core.types import GameState, Id
+
+log = logging.getLogger(__name__)
+
+# (turn, game object, game state)
+CachedGame = Tuple[int, Any, GameState]
+
+
+class GameStateCache:
+    """
+    Per-worker LRU cache of deserialized game objects by room id.
+
+    Every entry keeps turn number of the cached state. Engines write through: game state is
+    persisted into db first and then cached and announced via Redis pub/sub, so other workers
+    could drop their outdated entries.
+    """
+
+    CHANNEL = "game-state"
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Init cache"""
+        self.maxsize = maxsize
+        self.games: OrderedDict[str, CachedGame] = OrderedDict()
+        # shared pub/sub manager of the worker, see :class:`core.websocket.RedisPubSubManager`
+        self.pubsub_client: Any = None
+
+    def get(self, room_id: Id) -> CachedGame | None:
+        """Get cached game, mark it as recently used"""
+        key = str(room_id)
+        cached = self.games.get(key)
+        if cached is not None:
+            self.games.move_to_end(key)
+        return cached
+
+    def set(self, room_id: Id, turn: int, game: Any, state: GameState) -> None:
+        """Cache game unless newer turn is already cached"""
+        key = str(room_id)
+        cached = self.games.get(key)
+        if cached is not None and cached[0] > turn:
+            return
+        self.games[key] = (turn, game, state)
+        self.games.move_to_end(key)
+        while len(self.games) > self.maxsize:
+            self.games.popitem(last=False)
+
+    def pop(self, room_id: Id) -> CachedGame | None:
+        """Remove game from cache and return it"""
+        return self.games.pop(str(room_id), None)
+
+    def invalidate(self, room_id: Id, turn: int) -> None:
+        """Drop cached game if it's older than turn"""
+        key = str(room_id)
+        cached = self.games.get(key)
+        if cached is not None and cached[0] < turn:
+            del self.games[key]
+
+    def clear(self) -> None:
+        """Drop all cached games"""
+        self.games.clear()
+
+    async def listen(self, pubsub_client: Any) -> None:
+        """Listen to game state updates made by other workers"""
+        self.pubsub_client = pubsub_client
+        await pubsub_client.subscribe(self.CHANNEL, self._handle_update)
+
+    async def publish(self, room_id: Id, turn: int) -> None:
+        """Announce new game state to other workers"""
+        if not self.pubsub_client:
+            return
+        await self.pubsub_client.publish(self.CHANNEL, f"{room_id}:{turn}")
+
+    async def _handle_update(self, channel: str, data: str) -> None:
+        """Invalidate game updated by other worker"""
+        try:
+            room_id, turn = data.rsplit(":", 1)
+            self.invalidate(room_id, int(turn))
+        except ValueError:
+            log.warning("Invalid game state update message (%s)", data)
+
+
+game_state_cache = GameStateCache()
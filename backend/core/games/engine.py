@@ -2,12 +2,18 @@
 import uuid
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Tuple
+from typing import Any, Dict, List, Tuple, Type
 
-from core.games.exceptions import GameDataNotFound
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+
+from core.games.cache import game_state_cache
+from core.games.exceptions import GameDataNotFound, LegalMovesNotSupportedError, TurnConflictError
 from core.games.serializers import GameStateDataSerializer
-from core.resources.models import GameTurn
-from core.types import GameData, GameDataTurn, GameState
+from core.games.turn_log import is_checkpoint_turn, make_delta, restore_state
+from core.resources.models import GameTurn, Room
+from core.types import GameData, GameDataTurn, GameState, Id
+from core.utils import Serializable
 
 
 class GameEngine(ABC):
@@ -26,7 +32,9 @@ class GameEngine(ABC):
         """poll game state"""
 
     @abstractmethod
-    async def save(self, state: GameState) -> None:
+    async def save(
+        self, state: GameState, turn: GameDataTurn | None = None, previous: GameState | None = None
+    ) -> None:
         """save game state"""
 
     @abstractmethod
@@ -37,6 +45,14 @@ class GameEngine(ABC):
     async def get_game_data(self) -> GameData:
         """Get the latest game state data"""
 
+    @abstractmethod
+    async def poll_views(self) -> Dict[str, GameState]:
+        """Poll the last game state for every player and spectators (empty key) at once"""
+
+    async def legal_moves(self, player_id: str) -> List[GameDataTurn]:
+        """All valid turns of the player in the latest game state"""
+        raise LegalMovesNotSupportedError
+
 
 class BaseGameEngine(GameEngine):
     """
@@ -49,37 +65,153 @@ class BaseGameEngine(GameEngine):
     class MyGameEngine(BaseGameEngine):
         ...
 
-    def create_engine(room_id: str) -> MyGameEngine:
-        return MyGameEngine(room_id=room_id)
+    def create_engine(room_id: str, **kwargs: Any) -> MyGameEngine:
+        return MyGameEngine(room_id=room_id, **kwargs)
 
+    Game state is stored as turn log: full state (checkpoint) every `checkpoint_interval` turns
+    and compact deltas between them. Interval 1 stores full state on every turn.
+
+    Room keeps pointer to the latest game turn and its number (state version), so the latest
+    state is restored from turns starting at the checkpoint of that version. Loaded game objects are kept in per-worker
+    :data:`core.games.cache.game_state_cache`.
     """
 
+    # game state DTO class
+    STATE_DTO: Type[Serializable]
+    # keys of the turn data saved in turn log
+    TURN_FIELDS: Tuple[str, ...] = ()
+
     def __init__(
-        self, game_cls: Any, room_id: str, state_serializer: GameStateDataSerializer
+        self,
+        game_cls: Any,
+        room_id: str,
+        state_serializer: GameStateDataSerializer,
+        checkpoint_interval: int = 1,
+        current_turn_id: Id | None = None,
+        state_version: int = 0,
     ) -> None:
         """init game engine"""
         self.game_cls = game_cls
         self.room_id = room_id
         # could serialize state data to game object and back
         self.state_serializer = state_serializer
+        self.checkpoint_interval = checkpoint_interval
+        # the latest known game turn of the room
+        self.current_turn_id = current_turn_id
+        self.state_version = state_version
 
-    async def save(self, state: GameState) -> None:
+    async def save(
+        self, state: GameState, turn: GameDataTurn | None = None, previous: GameState | None = None
+    ) -> None:
         """persist game state into db"""
-        await GameTurn.create(room_id=self.room_id, turn=state["turn"], data=state)
+        if (
+            previous is None
+            or is_checkpoint_turn(state["turn"], self.checkpoint_interval)
+            # state format has been changed, fields can't be compared
+            or previous.get("version") != state.get("version")
+        ):
+            data, checkpoint = state, True
+        else:
+            turn_input = {k: turn[k] for k in self.TURN_FIELDS if k in turn} if turn else None
+            data, checkpoint = make_delta(previous, state, turn_input), False
+        room = Room.filter(id=self.room_id)
+        if previous is not None:
+            # optimistic lock: turn is applied only to the state it has been made for
+            room = room.filter(state_version=previous["turn"])
+        try:
+            async with in_transaction():
+                game_turn = await GameTurn.create(
+                    room_id=self.room_id, turn=state["turn"], data=data, checkpoint=checkpoint
+                )
+                # move room pointer to the latest turn
+                updated = await room.update(
+                    current_turn_id=game_turn.id, state_version=game_turn.turn
+                )
+                if not updated:
+                    raise TurnConflictError
+        except IntegrityError:
+            # turn with the same number has been already saved
+            raise TurnConflictError
+        self.current_turn_id = game_turn.id
+        self.state_version = game_turn.turn
+
+    async def save_game(
+        self,
+        game: Any,
+        state: GameState,
+        turn: GameDataTurn | None = None,
+        previous: GameState | None = None,
+    ) -> None:
+        """Persist game state into db and keep game object in cache"""
+        await self.save(state, turn=turn, previous=previous)
+        game_state_cache.set(self.room_id, state["turn"], game, state)
+        await game_state_cache.publish(self.room_id, state["turn"])
 
     async def setup(self, players: List[str]) -> None:
         """Setup new game"""
         game = self.game_cls.init_new_game(players)
         # transform to json-serializable object to persist into db
         game_state = self.state_serializer.dumps(game)
-        await self.save(game_state)
+        # forget previous game in this room if any
+        game_state_cache.pop(self.room_id)
+        await self.save_game(game, game_state)
+
+    async def load_game(self, for_update: bool = False) -> Tuple[Any, GameState]:
+        """
+        Load the latest game object and its state, from cache if possible.
+
+        Game object is removed from cache when loaded for update, since it's going to be changed.
+        """
+        if for_update:
+            cached = game_state_cache.pop(self.room_id)
+        else:
+            cached = game_state_cache.get(self.room_id)
+        # room could have been updated by another worker which message hasn't been received yet
+        if cached and cached[0] >= self.state_version:
+            _, game, state = cached
+            return game, state
+        state = await self.get_game_data()
+        game = self.state_serializer.loads(self.STATE_DTO(**state))  # type: ignore
+        if not for_update:
+            game_state_cache.set(self.room_id, state["turn"], game, state)
+        return game, state
+
+    async def poll_views(self) -> Dict[str, GameState]:
+        """Poll the last game state for every player and spectators (empty key) at once"""
+        game, _ = await self.load_game()
+        views = {"": await self.poll()}
+        for player in game.players:
+            views[player.id] = await self.poll(player.id)
+        return views
+
+    async def get_game_data_dto(self) -> Serializable:
+        """Get game data and prepare it for load"""
+        return self.STATE_DTO(**await self.get_game_data())
 
     async def get_game_data(self) -> GameData:
-        """Get the latest game state from db"""
-        turn = await GameTurn.filter(room_id=self.room_id).order_by("-turn").first()
-        if not turn:
+        """
+        Get the latest game state from db.
+
+        Checkpoint of the room's state version and deltas after it are fetched by single range
+        query over (room_id, turn) index.
+        """
+        interval = max(self.checkpoint_interval, 1)
+        turns = await GameTurn.filter(
+            room_id=self.room_id, turn__gte=self.state_version // interval * interval
+        ).order_by("turn")
+        for index in range(len(turns) - 1, -1, -1):
+            if turns[index].checkpoint:
+                return restore_state(turns[index].data, (t.data for t in turns[index + 1 :]))
+        # checkpoint interval has been changed, look up checkpoint and replay all deltas after it
+        checkpoint = (
+            await GameTurn.filter(room_id=self.room_id, checkpoint=True).order_by("-turn").first()
+        )
+        if not checkpoint:
             raise GameDataNotFound
-        return turn.data
+        deltas = await GameTurn.filter(room_id=self.room_id, turn__gt=checkpoint.turn).order_by(
+            "turn"
+        )
+        return restore_state(checkpoint.data, (t.data for t in deltas))
 
     def is_in_progress(self, game_status: str) -> bool:
         """True if game is in progress"""
@@ -1,4 +1,6 @@
 """Game exceptions"""
+from typing import Any
+
 from core.resources.errors import Error, ValidationError
 
 
@@ -21,3 +23,23 @@ class TurnOrderViolationError(ValidationError):
 
     error_code = "GE01"
     error_message = "Wrong turn order"
+
+
+class TurnConflictError(ValidationError):
+    """Game state has been changed by another turn"""
+
+    error_code = "GE02"
+    error_message = "Game state has been changed by another turn"
+
+    def __init__(self, status_code: int = 409, *args: Any, **kwargs: Any) -> None:
+        super().__init__(status_code, *args, **kwargs)
+
+
+class LegalMovesNotSupportedError(ValidationError):
+    """Game doesn't enumerate legal moves"""
+
+    error_code = "GE03"
+    error_message = "Game does not provide legal moves"
+
+    def __init__(self, status_code: int = 404, *args: Any, **kwargs: Any) -> None:
+        super().__init__(status_code, *args, **kwargs)
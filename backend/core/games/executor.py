@@ -0,0 +1,58 @@
+"""Game turn executor"""
+import asyncio
+import logging
+
+from typing import Any, Awaitable, Callable, Dict
+
+from core.games.exceptions import TurnConflictError
+from core.types import Id
+
+log = logging.getLogger(__name__)
+
+
+class TurnExecutor:
+    """
+    Applies game turns of a room one by one.
+
+    Turns of the same room wait in FIFO order for the room lock, turns of different rooms run
+    concurrently. Turn rejected because another worker has changed game state in the meantime
+    (:class:`core.games.exceptions.TurnConflictError`) is retried against the new state.
+    """
+
+    def __init__(self, retries: int = 3) -> None:
+        """Init executor"""
+        self.retries = retries
+        self.locks: Dict[str, asyncio.Lock] = {}
+        # number of turns running or waiting per room
+        self.waiters: Dict[str, int] = {}
+
+    async def run(self, room_id: Id, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Run turn function in room queue"""
+        key = str(room_id)
+        lock = self.locks.setdefault(key, asyncio.Lock())
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                return await self._run_with_retries(key, func, *args)
+        finally:
+            self.waiters[key] -= 1
+            if not self.waiters[key]:
+                del self.waiters[key]
+                del self.locks[key]
+
+    async def _run_with_retries(
+        self, room_id: str, func: Callable[..., Awaitable[Any]], *args: Any
+    ) -> Any:
+        """Run turn function, retry it on turn conflict"""
+        attempt = 0
+        while True:
+            try:
+                return await func(*args)
+            except TurnConflictError:
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+                log.info("Turn conflict in room (%s), retry %s", room_id, attempt)
+
+
+turn_executor = TurnExecutor()
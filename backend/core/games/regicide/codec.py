@@ -0,0 +1,27 @@
+"""Compact card codec"""
+from typing import Iterable, List, Tuple
+
+from core.games.regicide.dto import FlatCard
+from core.games.regicide.models import Card, CardRank, Suit
+
+# game state format: 1 - cards are (rank, suit) pairs, 2 - cards are hex strings of card codes
+LEGACY_STATE_VERSION = 1
+STATE_VERSION = 2
+
+# card code (0-51) is index of the card in the list
+CARDS: Tuple[Card, ...] = tuple(Card(rank, suit) for rank in CardRank for suit in Suit)
+
+
+def encode_cards(cards: Iterable[Card]) -> str:
+    """Encode cards into hex string, one byte per card"""
+    return bytes(card.code for card in cards).hex()
+
+
+def decode_cards(data: str) -> List[Card]:
+    """Decode cards from hex string"""
+    return [CARDS[code] for code in bytes.fromhex(data)]
+
+
+def decode_flat_cards(cards: List[FlatCard]) -> List[Card]:
+    """Decode cards stored as (rank, suit) pairs by the legacy format"""
+    return [Card(rank, suit) for rank, suit in cards]
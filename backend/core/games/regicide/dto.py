@@ -5,6 +5,8 @@ from typing import List, Tuple
 from core.utils import Serializable
 
 FlatCard = Tuple[str, str]
+# hex string of card codes, see `core.games.regicide.codec`
+EncodedCards = str
 
 
 @dataclass(frozen=True)
@@ -18,14 +20,16 @@ class PlayerHand(Serializable):
 class GameStateDto(Serializable):
     """Represents internal game state data"""
 
-    enemy_deck: List[FlatCard]
-    discard_deck: List[FlatCard]
+    enemy_deck: List[FlatCard] | EncodedCards
+    discard_deck: List[FlatCard] | EncodedCards
     active_player_id: str
-    players: List[Tuple[str, List[FlatCard]]]
-    played_combos: List[List[FlatCard]]
+    players: List[Tuple[str, List[FlatCard] | EncodedCards]]
+    played_combos: List[List[FlatCard] | EncodedCards]
     status: str
-    tavern_deck: List[FlatCard]
+    tavern_deck: List[FlatCard] | EncodedCards
     turn: int
+    # format of the cards, states saved before versioning have flat cards
+    version: int = 1
 
 
 @dataclass(frozen=True)
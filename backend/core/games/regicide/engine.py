@@ -1,9 +1,9 @@
 """Regicide game engine"""
-from typing import Any, Tuple, cast
+from typing import Any, List, Tuple, cast
 
 from core.games.engine import BaseGameEngine
 from core.games.regicide.dto import GameStateDto
-from core.games.regicide.game import Regicide
+from core.games.regicide.game import Regicide, legal_moves
 from core.games.regicide.models import Status
 from core.games.regicide.serializers import (
     RegicideGameStateDataSerializer,
@@ -21,6 +21,8 @@ class RegicideGameEngine(BaseGameEngine):
         Status.PLAYING_CARDS.value,
         Status.DISCARDING_CARDS.value,
     )
+    STATE_DTO = GameStateDto
+    TURN_FIELDS = ("cards",)
 
     def __init__(
         self,
@@ -28,48 +30,50 @@ class RegicideGameEngine(BaseGameEngine):
         room_id: str,
         state_serializer: GameStateDataSerializer,
         turn_serializer: GameTurnDataSerializer,
+        **kwargs: Any,
     ) -> None:
         """Init game engine"""
-        super().__init__(game_cls, room_id, state_serializer)
+        super().__init__(game_cls, room_id, state_serializer, **kwargs)
         self.turn_serializer = turn_serializer
 
     async def update(self, player_id: str, turn: GameDataTurn) -> Tuple[GameState, str]:
         """Update game state"""
-        # transform from flat cards to Card objects
-        game_data_dto = await self.get_game_data_dto()
-        game: Regicide = self.state_serializer.loads(game_data_dto)  # type: ignore
+        game: Regicide
+        game, previous = await self.load_game(for_update=True)
         # update game state
         game = game.make_turn(player_id, turn)
         # save changes
         game_state = self.state_serializer.dumps(game)
-        await self.save(game_state)
+        await self.save_game(game, game_state, turn=turn, previous=previous)
         # return turn game state for the player
         turn_game_state = self.turn_serializer.dumps(game, player_id=player_id)
         return turn_game_state, game.status.value
 
     async def poll(self, player_id: str | None = None) -> GameState:
         """Poll the last turn data"""
-        game_data_dto = await self.get_game_data_dto()
-        game: Regicide = self.state_serializer.loads(game_data_dto)  # type: ignore
+        game: Regicide
+        game, _ = await self.load_game()
         # we can't just return latest game state, because players don't know full game state and
         # don't see same data. We partially serialize game state (turn) with data player could see
         turn_game_state = self.turn_serializer.dumps(game, player_id=player_id)
         return turn_game_state
 
-    async def get_game_data_dto(self) -> GameStateDto:
-        """Get game data and prepare it for load"""
-        return GameStateDto(**await self.get_game_data())
+    async def legal_moves(self, player_id: str) -> List[GameDataTurn]:
+        """All valid turns of the player in the latest game state"""
+        game, _ = await self.load_game()
+        return legal_moves(game, player_id)
 
     def is_in_progress(self, game_status: str) -> bool:
         """True if game is in progress"""
         return game_status in self.STATUSES_IN_PROGRESS
 
 
-def create_engine(room_id: str) -> RegicideGameEngine:
+def create_engine(room_id: str, **kwargs: Any) -> RegicideGameEngine:
     """Create instance of game engine"""
     return RegicideGameEngine(
         game_cls=Regicide,
         room_id=room_id,
         state_serializer=cast(GameStateDataSerializer, RegicideGameStateDataSerializer),
         turn_serializer=cast(GameTurnDataSerializer, RegicideGameTurnDataSerializer),
+        **kwargs,
     )
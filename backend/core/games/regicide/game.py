@@ -15,7 +15,19 @@ from core.games.regicide.exceptions import (
     MaxComboSizeExceededError,
     NotEnoughPowerToDiscard,
 )
-from core.games.regicide.models import Card, CardCombo, CardRank, Deck, Enemy, Player, Status, Suit
+from core.games.regicide.models import (
+    Card,
+    CardCombo,
+    CardHand,
+    CardRank,
+    Deck,
+    Enemy,
+    Player,
+    Status,
+    Suit,
+    has_suit,
+)
+from core.games.regicide.utils import to_flat_hand
 from core.games.utils import infinite_cycle
 from core.types import GameDataTurn
 
@@ -25,7 +37,7 @@ ENEMY_RANKS = (CardRank.JACK, CardRank.QUEEN, CardRank.KING)
 
 def cards_belong_to_player(player: Player, combo: CardCombo) -> bool:
     """True if all cards in combo from players hand"""
-    return all(card in player.hand for card in combo)
+    return player.has_cards(combo)
 
 
 def get_total_damage_to_enemy(enemy: Enemy, cards: List[CardCombo]) -> int:
@@ -56,12 +68,12 @@ def is_enemy_defeated(enemy: Enemy, cards: List[CardCombo]) -> bool:
 
 def has_diamonds(combo: CardCombo) -> bool:
     """True if combo has diamond suit"""
-    return any(Suit.DIAMONDS == card.suit for card in combo)
+    return has_suit(combo, Suit.DIAMONDS)
 
 
 def has_hearts(combo: CardCombo) -> bool:
     """True if combo has hearts suit"""
-    return any(Suit.HEARTS == card.suit for card in combo)
+    return has_suit(combo, Suit.HEARTS)
 
 
 class Regicide(Game):
@@ -251,7 +263,7 @@ class Regicide(Game):
                 for player in players_loop:
                     if len(player.hand) >= player.max_hand_size:
                         continue
-                    player.hand.append(card)
+                    player.add_card(card)
                     break
 
     def _create_tavern_deck(self) -> None:
@@ -334,3 +346,67 @@ def validate_game_turn(game: Regicide, player_id: str, turn: dict) -> None:
         validate_can_play_cards(game, player, combo)
     elif game.is_discarding_cards_state:
         validate_can_discard_cards(game, player, combo)
+
+
+def get_play_combos(hand: CardHand) -> List[CardCombo]:
+    """All combos could be played from hand: singles, aces with companion and same rank combos"""
+    combos: List[CardCombo] = [[card] for card in hand]
+    aces = [card for card in hand if card.rank is CardRank.ACE]
+    for ace in aces:
+        for card in hand:
+            # pair of aces is added once
+            if card is not ace and not (card.rank is CardRank.ACE and card < ace):
+                combos.append([ace, card])
+    for rank in DUPLICATED_COMBO_RANKS:
+        cards = [card for card in hand if card.rank is rank]
+        for size in range(2, len(cards) + 1):
+            if Card.get_combo_damage(cards[:size]) > 10:
+                break
+            combos.extend(map(list, itertools.combinations(cards, size)))
+    return combos
+
+
+def get_discard_combos(hand: CardHand, damage: int) -> List[CardCombo]:
+    """
+    All minimal sets of cards to discard to suffer enemy attack damage.
+
+    Set is minimal if it isn't enough to suffer damage without any of its cards. Cards are
+    taken by attack in descending order until damage is covered, so the last taken card is the
+    weakest one and every found set is minimal.
+    """
+    cards = sorted(hand, key=lambda c: c.attack, reverse=True)
+    # attack of the cards left after index
+    remaining = list(itertools.accumulate((card.attack for card in reversed(cards)), initial=0))
+    remaining.reverse()
+    # discarded cards can't be empty
+    damage = max(damage, 1)
+    combos: List[CardCombo] = []
+
+    def collect(start: int, combo: CardCombo, total: int) -> None:
+        for index in range(start, len(cards)):
+            if total + remaining[index] < damage:
+                # the rest of cards isn't enough
+                return
+            card = cards[index]
+            if total + card.attack >= damage:
+                combos.append([*combo, card])
+            else:
+                collect(index + 1, [*combo, card], total + card.attack)
+
+    collect(0, [], 0)
+    return combos
+
+
+def legal_moves(game: Regicide, player_id: str) -> List[GameDataTurn]:
+    """All valid turns of the player in current game state, empty if it's not player's turn"""
+    if not game.is_game_in_progress or game.active_player.id != player_id:
+        return []
+    player = game.active_player
+    if game.is_playing_cards_state:
+        # player could skip playing cards
+        combos = [*get_play_combos(player.hand), []]
+    else:
+        enemy = game.current_enemy
+        damage = get_enemy_attack_damage(enemy, game.played_combos) if enemy else 0
+        combos = get_discard_combos(player.hand, damage)
+    return [{"cards": to_flat_hand(combo)} for combo in combos]
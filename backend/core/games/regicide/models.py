@@ -3,7 +3,8 @@ import enum
 import json
 import random
 
-from typing import List, Optional, TypeVar
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, TypeVar
 
 Enemy = TypeVar("Enemy", bound="Card")
 CardCombo = List["Card"]
@@ -60,17 +61,47 @@ class Suit(enum.Enum):
 
 
 class Player:
-    """Player"""
+    """
+    Player.
+
+    Besides the list of cards the hand is kept as bitmask of card bits (`hand_mask`), so
+    membership and suit checks are bitwise operations. Hand has to be changed by assigning
+    `hand` or with `add_card` and `remove_cards_from_hand` to keep them in sync.
+    """
 
     def __init__(self, id: str, hand: Optional[CardHand] = None, hand_size: int = 7) -> None:
         """Init player"""
         self.id = id
-        self.hand: CardHand = sorted(hand) if hand else []
+        self.hand = sorted(hand) if hand else []
         self.max_hand_size = hand_size
 
+    @property
+    def hand(self) -> CardHand:
+        """Cards on hand"""
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards: CardHand) -> None:
+        """Set cards on hand"""
+        self._hand = cards
+        self.hand_mask = cards_mask(cards)
+
+    def add_card(self, card: "Card") -> None:
+        """Add card to hand"""
+        self._hand.append(card)
+        self.hand_mask |= card.bit
+
+    def has_cards(self, combo: CardCombo) -> bool:
+        """True if all cards of combo are on hand"""
+        mask = cards_mask(combo)
+        return mask & self.hand_mask == mask
+
     def remove_cards_from_hand(self, combo: CardCombo) -> None:
         """Removes cards from hand"""
-        self.hand = list(filter(lambda c: c not in combo, self.hand))
+        removed = cards_mask(combo) & self.hand_mask
+        if removed:
+            self._hand = [card for card in self._hand if not card.bit & removed]
+            self.hand_mask ^= removed
 
     def __str__(self) -> str:
         """To string"""
@@ -78,7 +109,13 @@ class Player:
 
 
 class Card:
-    """Card"""
+    """
+    Card.
+
+    There are only 52 cards, so they are interned: `Card(rank, suit)` returns the same immutable
+    instance every time. Attack, health, sort key and code are computed once, cards are compared
+    by identity and integer sort key.
+    """
 
     ATTACK = {
         CardRank.TWO: 2,
@@ -102,26 +139,62 @@ class Card:
     }
     # used for comparison
     FACE_CARD_RANKS = {CardRank.JACK: 11, CardRank.QUEEN: 12, CardRank.KING: 13, CardRank.ACE: 14}
+    # cards of the same rank are ordered by suit symbol
+    SUIT_ORDER = {suit: index for index, suit in enumerate(sorted(Suit, key=lambda s: s.value))}
+
+    __slots__ = ("rank", "suit", "code", "bit", "attack", "health", "sort_key", "suit_flag")
+
+    # (rank, suit) and (rank value, suit value) -> card
+    _cards: Dict[Tuple[CardRank | str, Suit | str], "Card"] = {}
+
+    rank: CardRank
+    suit: Suit
+    # index of the card (0-51): rank index * 4 + suit index
+    code: int
+    # 1 << code, bit of the card in hand bitmask
+    bit: int
+    attack: int
+    # 0 for non face cards
+    health: int
+    sort_key: int
+    # one bit per suit
+    suit_flag: int
+
+    def __new__(cls, rank: str | CardRank, suit: str | Suit) -> "Card":
+        """Get card, raises ValueError for unknown rank or suit"""
+        try:
+            return cls._cards[rank, suit]  # type: ignore[index]
+        except (KeyError, TypeError):
+            pass
+        rank = CardRank(rank) if isinstance(rank, str) else rank
+        suit = Suit(suit) if isinstance(suit, str) else suit
+        try:
+            return cls._cards[rank, suit]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid card ({rank}, {suit})")
 
-    def __init__(self, rank: str | CardRank, suit: str | Suit) -> None:
-        """Init Card"""
-        self.rank = CardRank(rank) if isinstance(rank, str) else rank
-        self.suit = Suit(suit) if isinstance(suit, str) else suit
-
-    @property
-    def health(self) -> int:
-        """Get health"""
-        return self.HEALTH[self.rank]
-
-    @property
-    def attack(self) -> int:
-        """Get attack power"""
-        return self.ATTACK[self.rank]
+    @classmethod
+    def _intern(cls, code: int, rank: CardRank, suit: Suit) -> "Card":
+        """Create card instance"""
+        card = object.__new__(cls)
+        rank_value = cls.FACE_CARD_RANKS.get(rank) or int(rank.value)
+        for name, value in (
+            ("rank", rank),
+            ("suit", suit),
+            ("code", code),
+            ("bit", 1 << code),
+            ("attack", cls.ATTACK[rank]),
+            ("health", cls.HEALTH.get(rank, 0)),
+            ("sort_key", rank_value * len(Suit) + cls.SUIT_ORDER[suit]),
+            ("suit_flag", 1 << list(Suit).index(suit)),
+        ):
+            object.__setattr__(card, name, value)
+        return card
 
     @staticmethod
     def is_double_damage(combo: CardCombo, enemy: Enemy) -> bool:
         """True if possible to double cards attack"""
-        return enemy.suit != Suit.CLUBS and any(card.suit == Suit.CLUBS for card in combo)
+        return enemy.suit is not Suit.CLUBS and has_suit(combo, Suit.CLUBS)
 
     @classmethod
     def get_attack_power(cls, combo: CardCombo, enemy: Enemy) -> int:
@@ -144,7 +217,7 @@ class Card:
         """
         return (
             self.get_combo_damage(combo)
-            if self.suit != Suit.SPADES and any(card.suit == Suit.SPADES for card in combo)
+            if self.suit is not Suit.SPADES and has_suit(combo, Suit.SPADES)
             else 0
         )
 
@@ -152,52 +225,94 @@ class Card:
         """Calculate reduced enemy attack by played cards"""
         return sum(self.get_reduced_attack_power(combo) for combo in combos)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Cards are immutable"""
+        raise AttributeError("Card is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Cards are immutable"""
+        raise AttributeError("Card is immutable")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Unpickle to the interned card"""
+        return Card, (self.rank, self.suit)
+
+    def __copy__(self) -> "Card":
+        """Cards are never copied"""
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Card":
+        """Cards are never copied"""
+        return self
+
     def __str__(self) -> str:
         """To string"""
         return f"{self.suit.value} {self.rank.value}"
 
+    def __repr__(self) -> str:
+        """Representation"""
+        return f"Card({self.rank.value!r}, {self.suit.value!r})"
+
+    def __hash__(self) -> int:
+        """Hash"""
+        return self.code
+
     def __eq__(self, other) -> bool:
         """True if object are equal"""
         if isinstance(other, Card):
-            return (self._rank_value(self.rank), self.suit.value) == (
-                self._rank_value(other.rank),
-                other.suit.value,
-            )
+            return self is other
         if isinstance(other, tuple) or isinstance(other, list):
-            return (self._rank_value(self.rank), self.suit.value) == (
-                self._rank_value(other[0]),
-                other[1],
-            )
+            try:
+                return self is Card(other[0], other[1])
+            except (ValueError, IndexError):
+                return False
         return NotImplemented
 
-    def _rank_value(self, rank: CardRank | int) -> int:
-        """"""
-        rank_: CardRank = CardRank(rank) if isinstance(rank, int) else rank
-        if rank_ in self.FACE_CARD_RANKS:
-            return self.FACE_CARD_RANKS[rank_]
-        return int(rank_.value)
-
     def __lt__(self, other) -> bool:
         """Less than"""
-        t1 = self._rank_value(self.rank), self.suit.value
-        t2 = self._rank_value(other.rank), other.suit.value
-        return t1 < t2
+        return self.sort_key < other.sort_key
 
     def __gt__(self, other) -> bool:
         """Greater than"""
-        t1 = self._rank_value(self.rank), self.suit.value
-        t2 = self._rank_value(other.rank), other.suit.value
-        return t1 > t2
+        return self.sort_key > other.sort_key
+
+
+def _intern_cards() -> None:
+    """Create all 52 cards"""
+    for rank_index, rank in enumerate(CardRank):
+        for suit_index, suit in enumerate(Suit):
+            card = Card._intern(rank_index * len(Suit) + suit_index, rank, suit)
+            Card._cards[rank, suit] = Card._cards[rank.value, suit.value] = card
+
+
+_intern_cards()
+
+# suit -> bitmask of all cards of the suit
+SUIT_MASKS: Dict[Suit, int] = {
+    suit: sum(card.bit for key, card in Card._cards.items() if key[1] is suit) for suit in Suit
+}
+
+
+def cards_mask(cards: Iterable[Card]) -> int:
+    """Get bitmask of cards"""
+    mask = 0
+    for card in cards:
+        mask |= card.bit
+    return mask
+
+
+def has_suit(cards: Iterable[Card] | int, suit: Suit) -> bool:
+    """True if cards (or bitmask of cards) contain card of the suit"""
+    mask = cards if isinstance(cards, int) else cards_mask(cards)
+    return bool(mask & SUIT_MASKS[suit])
 
 
 class Deck:
-    """Card deck"""
+    """Card deck, cards are drawn from the top (left) and added to the bottom (right)"""
 
-    def __init__(self, cards: Optional[CardHand] = None) -> None:
+    def __init__(self, cards: Optional[Iterable[Card]] = None) -> None:
         """Init deck"""
-        if not cards:
-            cards = []
-        self.cards: CardHand = cards
+        self.cards: Deque[Card] = deque(cards or ())
 
     def peek(self) -> Optional[Card]:
         """Peek first element from the deck"""
@@ -205,37 +320,37 @@ class Deck:
 
     def pop(self) -> Card:
         """Pop first element from the deck"""
-        card = self.cards[0]
-        self.cards = self.cards[1:]
-        return card
+        return self.cards.popleft()
 
     def pop_many(self, count: int = 1) -> CardCombo:
         """Pop first element from the deck"""
         assert count <= len(self.cards), "Can't pop more deck contains."
-        cards = self.cards[:count]
-        self.cards = self.cards[count:]
-        return cards
+        popleft = self.cards.popleft
+        return [popleft() for _ in range(count)]
 
-    def append(self, cards: Card | CardCombo) -> None:
+    def append(self, cards: Card | Iterable[Card]) -> None:
         """Append single or several cards to the end of a deck"""
-        if isinstance(cards, List):
-            self.cards = self.cards + cards
-        else:
+        if isinstance(cards, Card):
             self.cards.append(cards)
+        else:
+            self.cards.extend(cards)
 
     def clear(self) -> int:
         """Return size of cleaned deck"""
         size = len(self.cards)
-        self.cards = []
+        self.cards.clear()
         return size
 
     def shuffle(self) -> None:
         """Randomize deck"""
-        random.shuffle(self.cards)
+        # random access to the middle of deque isn't O(1), shuffle a list instead
+        cards = list(self.cards)
+        random.shuffle(cards)
+        self.cards = deque(cards)
 
     def __str__(self) -> str:
         """To string"""
-        return json.dumps(self.cards)
+        return json.dumps([str(card) for card in self.cards])
 
     def __len__(self) -> int:
         """Length of card deck"""
@@ -1,4 +1,7 @@
 """Game data serializer"""
+from typing import Any, Callable, List
+
+from core.games.regicide.codec import STATE_VERSION, decode_cards, decode_flat_cards, encode_cards
 from core.games.regicide.dto import GameStateDto, GameTurnDataDto, PlayerHand
 from core.games.regicide.game import (
     Regicide,
@@ -6,7 +9,7 @@ from core.games.regicide.game import (
     get_remaining_enemy_health,
     infinite_cycle,
 )
-from core.games.regicide.models import Card, Deck, Player, Status, Suit
+from core.games.regicide.models import Card, Deck, Player, Status
 from core.games.regicide.utils import to_flat_hand
 from core.types import GameState
 
@@ -49,42 +52,26 @@ class RegicideGameTurnDataSerializer:
 
 
 class RegicideGameStateDataSerializer:
-    """Regicide game state serializer"""
+    """
+    Regicide game state serializer.
+
+    Cards are stored as hex strings of card codes, states with (rank, suit) pairs are still loaded.
+    """
 
     @staticmethod
     def loads(data: GameStateDto) -> Regicide:
         """Deserialize game state DTO to game object"""
-        # fmt: off
+        decode: Callable[[Any], List[Card]] = (
+            decode_cards if data.version >= STATE_VERSION else decode_flat_cards
+        )
         game = Regicide(list(map(lambda p: p[0], data.players)))
-        game.players = [
-            Player(player_id, [
-                Card(card[0], Suit(card[1]))
-                for card in hand
-            ])
-            for player_id, hand in data.players
-        ]
-        game.played_combos = [
-            [
-                Card(card[0], Suit(card[1]))
-                for card in combo
-            ]
-            for combo in data.played_combos
-        ]
-        game.discard_deck = Deck([
-            Card(rank, Suit(suit))
-            for rank, suit in data.discard_deck
-        ])
-        game.tavern_deck = Deck([
-            Card(rank, Suit(suit))
-            for rank, suit in data.tavern_deck
-        ])
-        game.enemy_deck = Deck([
-            Card(rank, Suit(suit))
-            for rank, suit in data.enemy_deck
-        ])
+        game.players = [Player(player_id, decode(hand)) for player_id, hand in data.players]
+        game.played_combos = [decode(combo) for combo in data.played_combos]
+        game.discard_deck = Deck(decode(data.discard_deck))
+        game.tavern_deck = Deck(decode(data.tavern_deck))
+        game.enemy_deck = Deck(decode(data.enemy_deck))
         # FIXME: raise exception if player not found?
         game.active_player = game.find_player(data.active_player_id)  # type: ignore
-        # fmt: on
 
         # shift players' loop until first player from data
         game.next_player_loop = infinite_cycle(game.players)
@@ -100,12 +87,13 @@ class RegicideGameStateDataSerializer:
         """Serialize game object into game state DTO"""
 
         return GameStateDto(
-            enemy_deck=to_flat_hand(game.enemy_deck.cards),
-            discard_deck=to_flat_hand(game.discard_deck.cards),
+            enemy_deck=encode_cards(game.enemy_deck.cards),
+            discard_deck=encode_cards(game.discard_deck.cards),
             active_player_id=game.active_player.id,
-            players=[(pl.id, to_flat_hand(pl.hand)) for pl in game.players],
-            played_combos=[to_flat_hand(combo) for combo in game.played_combos],
+            players=[(pl.id, encode_cards(pl.hand)) for pl in game.players],
+            played_combos=[encode_cards(combo) for combo in game.played_combos],
             status=game.status.value,  # type: ignore
-            tavern_deck=to_flat_hand(game.tavern_deck.cards),
+            tavern_deck=encode_cards(game.tavern_deck.cards),
             turn=game.turn,
+            version=STATE_VERSION,
         ).asdict()
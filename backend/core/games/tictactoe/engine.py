@@ -1,5 +1,5 @@
 """Tic Tac Toe game engine"""
-from typing import Tuple, cast
+from typing import Any, Tuple, cast
 
 from core.games.engine import BaseGameEngine
 from core.games.serializers import GameStateDataSerializer
@@ -17,39 +17,38 @@ class TicTacToeGameEngine(BaseGameEngine):
         Status.CREATED.value,
         Status.IN_PROGRESS.value,
     )
+    STATE_DTO = GameStateDto
+    TURN_FIELDS = ("index",)
 
     async def update(self, player_id: str, turn: GameDataTurn) -> Tuple[GameState, str]:
         """Update game state"""
-        game_data_dto = await self.get_game_data_dto()
-        game: TicTacToe = self.state_serializer.loads(game_data_dto)  # type: ignore
+        game: TicTacToe
+        game, previous = await self.load_game(for_update=True)
         # update state
         game = game.make_turn(player_id, turn)
         # save changes
         game_state = self.state_serializer.dumps(game)
-        await self.save(game_state)
+        await self.save_game(game, game_state, turn=turn, previous=previous)
         # serialize updated game state
         return game_state, game.status.value
 
     async def poll(self, player_id: str | None = None) -> GameState:
         """Poll the last game state"""
-        game_data_gto = await self.get_game_data_dto()
+        _, game_state = await self.load_game()
         player_id = str(player_id) if player_id else None
         # we don't need to hide anything from other users, just serialize state
-        return dict(player_id=player_id, **game_data_gto.asdict())
-
-    async def get_game_data_dto(self) -> GameStateDto:
-        """Get game data and prepare it for load"""
-        return GameStateDto(**await self.get_game_data())
+        return dict(player_id=player_id, **game_state)
 
     def is_in_progress(self, game_status: str) -> bool:
         """True if game is in progress"""
         return game_status in self.STATUSES_IN_PROGRESS
 
 
-def create_engine(room_id: str) -> TicTacToeGameEngine:
+def create_engine(room_id: str, **kwargs: Any) -> TicTacToeGameEngine:
     """Create instance of game engine"""
     return TicTacToeGameEngine(
         game_cls=TicTacToe,
         room_id=room_id,
         state_serializer=cast(GameStateDataSerializer, TicTacToeGameStateDataSerializer),
+        **kwargs,
     )
@@ -21,7 +21,8 @@ class TicTacToeGameStateDataSerializer:
         while game.toggle_next_player_turn().id != data.active_player_id:
             pass
 
-        game.board = data.board
+        # copy board, game changes it in place
+        game.board = list(data.board)
         game.turn = data.turn
         game.status = Status(data.status)
         return game
@@ -32,7 +33,7 @@ class TicTacToeGameStateDataSerializer:
         return GameStateDto(
             active_player_id=game.active_player.id,
             players=[pl.id for pl in game.players],
-            board=game.board,
+            board=list(game.board),
             status=game.status.value,
             turn=game.turn,
             winner_id=str(game.winner.id) if game.winner else None,
@@ -0,0 +1,124 @@
+"""Game turn log"""
+from typing import Any, Callable, Iterable
+
+from core.resources.encoders import json_dumps
+from core.types import GameData, GameDataTurn, GameState
+
+# delta record keys, delta is stored instead of full game state between checkpoints
+DELTA_INPUT_KEY = "input"
+DELTA_DIFF_KEY = "diff"
+# changed part of list or string field: (start, end, items replacing old value[start:end])
+DELTA_SPLICE_KEY = "splice"
+# path of the nested value: field name and indexes of lists
+DELTA_PATH_SEPARATOR = "/"
+DELTA_MAX_DEPTH = 2
+
+
+def _plain(value: Any) -> Any:
+    """Convert tuples into lists to compare values the same way they are loaded from db"""
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+def is_checkpoint_turn(turn: int, interval: int) -> bool:
+    """True if full game state has to be stored for the turn"""
+    return interval <= 1 or turn % interval == 0
+
+
+def _splice(previous: Any, value: Any) -> list | None:
+    """
+    Get changed part of list or string value if it's shorter than the whole value.
+
+    Cards are drawn from the beginning of decks and hands, discarded to the end of decks, so
+    only items between common prefix and suffix are stored.
+    """
+    if type(previous) is not type(value) or not isinstance(value, (list, str)):
+        return None
+    size = min(len(previous), len(value))
+    start = 0
+    while start < size and previous[start] == value[start]:
+        start += 1
+    end = 0
+    while end < size - start and previous[-end - 1] == value[-end - 1]:
+        end += 1
+    if not start + end:
+        return None
+    splice = [start, len(previous) - end, value[start : len(value) - end]]
+    return splice if len(json_dumps(splice)) < len(json_dumps(value)) else None
+
+
+def _diff(previous: Any, value: Any, path: str, diff: dict, splices: dict) -> None:
+    """Collect changes of the value, items of lists of the same size are compared one by one"""
+    if (
+        isinstance(previous, list)
+        and isinstance(value, list)
+        and len(previous) == len(value)
+        and path.count(DELTA_PATH_SEPARATOR) < DELTA_MAX_DEPTH
+    ):
+        for index, (old, new) in enumerate(zip(previous, value)):
+            if old != new:
+                _diff(old, new, f"{path}{DELTA_PATH_SEPARATOR}{index}", diff, splices)
+        return
+    splice = _splice(previous, value)
+    if splice is not None:
+        splices[path] = splice
+    else:
+        diff[path] = value
+
+
+def make_delta(previous: GameState, state: GameState, turn: GameDataTurn | None = None) -> GameData:
+    """
+    Create delta record with turn input and state fields changed by the turn.
+
+    Changes are looked up inside lists (e.g. players, their hands), lists and strings are stored
+    as splices (changed items only) if that's shorter, other values are replaced. Nested values
+    are addressed by path, e.g. `players/1/1`.
+    """
+    diff: dict = {}
+    splices: dict = {}
+    for key, value in state.items():
+        value = _plain(value)
+        if key not in previous:
+            diff[key] = value
+            continue
+        old = _plain(previous[key])
+        if old != value:
+            _diff(old, value, key, diff, splices)
+    delta = {DELTA_INPUT_KEY: turn, DELTA_DIFF_KEY: diff}
+    if splices:
+        delta[DELTA_SPLICE_KEY] = splices
+    return delta
+
+
+def _set_path(state: GameState, path: str, change: Callable[[Any], Any]) -> None:
+    """Replace value by path with changed one, lists on the way are copied"""
+    key, *indexes = path.split(DELTA_PATH_SEPARATOR)
+    if not indexes:
+        state[key] = change(state[key])
+        return
+    container = state[key] = list(state[key])
+    for index in map(int, indexes[:-1]):
+        container[index] = list(container[index])
+        container = container[index]
+    container[int(indexes[-1])] = change(container[int(indexes[-1])])
+
+
+def apply_delta(state: GameState, delta: GameData) -> GameState:
+    """Apply delta record to game state"""
+    state = dict(state)
+    for path, value in delta[DELTA_DIFF_KEY].items():
+        _set_path(state, path, lambda _: value)
+    for path, (start, end, items) in delta.get(DELTA_SPLICE_KEY, {}).items():
+        _set_path(state, path, lambda old: old[:start] + items + old[end:])
+    return state
+
+
+def restore_state(checkpoint: GameState, deltas: Iterable[GameData]) -> GameState:
+    """Rebuild game state from checkpoint and deltas (ordered by turn)"""
+    state = checkpoint
+    for delta in deltas:
+        state = apply_delta(state, delta)
+    return state
@@ -1,13 +1,11 @@
 """Auth handlers"""
-import bcrypt
-import tornado
-
 from tortoise.expressions import Q
 
 from core.resources.auth import get_jwt_token
 from core.resources.errors import APIError
 from core.resources.handlers import BaseRequestHandler
 from core.resources.models import Player
+from core.resources.passwords import password_hasher
 
 
 class AuthSignUpHandler(BaseRequestHandler):
@@ -26,17 +24,8 @@ class AuthSignUpHandler(BaseRequestHandler):
                 status_code=400, reason="Player with this email or name already registered."
             )
 
-        hashed_password = await tornado.ioloop.IOLoop.current().run_in_executor(
-            None,
-            bcrypt.hashpw,
-            tornado.escape.utf8(password),
-            bcrypt.gensalt(),
-        )
-        await Player.create(
-            email=email,
-            name=username,
-            password=tornado.escape.to_unicode(hashed_password),
-        )
+        hashed_password = await password_hasher.hash(password)
+        await Player.create(email=email, name=username, password=hashed_password)
         self.set_status(204)
 
 
@@ -48,12 +37,7 @@ class AuthLoginHandler(BaseRequestHandler):
         player = await Player.filter(name=username).first()
         if not player:
             raise APIError(status_code=400, reason="Incorrect user or password.")
-        password_equal = await tornado.ioloop.IOLoop.current().run_in_executor(
-            None,
-            bcrypt.checkpw,
-            tornado.escape.utf8(password),
-            tornado.escape.utf8(player.password),
-        )
+        password_equal = await password_hasher.check(password, player.password)
         if not password_equal:
             raise APIError(status_code=400, reason="Incorrect user or password.")
 
@@ -62,6 +46,6 @@ class AuthLoginHandler(BaseRequestHandler):
             {
                 "user_id": user_id,
                 "username": username,
-                "token": await get_jwt_token(user_id),
+                "token": await get_jwt_token(user_id, player.name),
             }
         )
@@ -0,0 +1,11 @@
+"""Metrics handler"""
+from core.metrics import metrics
+from core.resources.handlers import BaseRequestHandler
+
+
+class MetricsHandler(BaseRequestHandler):
+    """Worker metrics handler"""
+
+    async def get(self) -> None:
+        """Render metrics of the worker"""
+        self.write(dict(metrics=metrics.snapshot()))
@@ -1,6 +1,9 @@
 """Room handlers"""
+import uuid
+
 import tornado
 
+from core.constants import ROOMS_PAGE_MAX_SIZE, ROOMS_PAGE_SIZE, GameRoomStatus
 from core.resources.auth import login_required
 from core.resources.errors import APIError
 from core.resources.handlers import BaseRequestHandler
@@ -17,7 +20,8 @@ class GameRoomHandler(BaseRequestHandler):
     async def post(self, game_id: str) -> None:
         """Create game room"""
         room_size = self.request.arguments.get("size")
-        data = await room_service.create_room(game_id, self.request.user, room_size)
+        user = await self.request.user.get_player()
+        data = await room_service.create_room(game_id, user, room_size)
         self.set_status(201)
         self.write(dict(data=data))
 
@@ -30,15 +34,27 @@ class RoomHandler(BaseRequestHandler):
 
     async def get(self, room_id: str | None = None) -> None:
         if not room_id:
-            # FIXME: add limit
-            # FIXME: filter open to join pages only
-            results = await room_service.get_available_rooms()
-            data = dict(results=results)
+            data = await room_service.get_available_rooms(**self.get_room_filters())
         else:
             room = await room_service.get_room_by_id(room_id)
             data = dict(data=room)
         self.write(data)
 
+    def get_room_filters(self) -> dict:
+        """Get room list filters from query arguments, rooms open to join by default"""
+        try:
+            status = self.get_query_argument("status", str(GameRoomStatus.CREATED.value))
+            limit = int(self.get_query_argument("limit", str(ROOMS_PAGE_SIZE)))
+            game_id = self.get_query_argument("game", None)
+            return dict(
+                status=int(status) if status else None,
+                game_id=str(uuid.UUID(game_id)) if game_id else None,
+                limit=min(max(limit, 1), ROOMS_PAGE_MAX_SIZE),
+                cursor=self.get_query_argument("cursor", None),
+            )
+        except ValueError:
+            raise APIError(400, "Validation error")
+
     @login_required
     async def put(self, room_id: str) -> None:
         """Player could setup game settings"""
@@ -63,6 +79,19 @@ class RoomDataHandler(BaseRequestHandler):
         self.write(dict(data=data))
 
 
+class RoomLegalMovesHandler(BaseRequestHandler):
+    """
+    Game Room legal moves request handler.
+    Allows to receive all valid turns of the player in the latest game state.
+    """
+
+    @login_required
+    async def get(self, room_id: str) -> None:
+        """Get valid turns of the current user, empty if it's not user's turn"""
+        data = await game_room_service.get_legal_moves(room_id, str(self.request.user.id))
+        self.write(dict(data=data))
+
+
 class RoomGameTurnHandler(BaseRequestHandler):
     """
     Game Turn data request handler.
@@ -76,9 +105,9 @@ class RoomGameTurnHandler(BaseRequestHandler):
         turn = self.request.arguments
         if not turn:
             raise APIError(400, "Validation error")
-        data = await game_room_service.make_turn(room_id, user, turn)
-        # notify all users to fetch updated data
-        await self.application.socket_manager.broadcast_to_room(room_id, "refresh")
+        data, views = await game_room_service.make_turn(room_id, user, turn)
+        # push updated game state to all users
+        await self.application.socket_manager.push_to_room(room_id, views)
         self.write(dict(data=data))
 
 
@@ -95,7 +124,7 @@ class RoomPlayersHandler(BaseRequestHandler):
         current_user = self.request.user
         if str(current_user.id) != player_id:
             raise APIError(401, "Can't perform this action.")
-        data = await room_service.join_room(room_id, current_user)
+        data = await room_service.join_room(room_id, await current_user.get_player())
         # notify all users to fetch updated data
         await self.application.socket_manager.broadcast_to_room(room_id, "refresh")
         self.set_status(201)
@@ -107,7 +136,7 @@ class RoomPlayersHandler(BaseRequestHandler):
         user = self.request.user
         if str(user.id) != player_id:
             raise APIError(401, "Can't perform this action.")
-        await room_service.leave_room(room_id, user)
+        await room_service.leave_room(room_id, await user.get_player())
         # notify all users to fetch updated data
         await self.application.socket_manager.broadcast_to_room(room_id, "refresh")
         self.set_status(204)
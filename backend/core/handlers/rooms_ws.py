@@ -1,10 +1,19 @@
 """Websocket handler"""
 import logging
 
+import jwt
+
+from tornado.ioloop import IOLoop
 from tornado.websocket import WebSocketHandler
 
+from core.resources.auth import decode_jwt_token
+from core.resources.encoders import json_loads
+
 log = logging.getLogger(__name__)
 
+# type of the message with JWT token, sent by client right after connection is opened
+AUTH_MESSAGE_TYPE = "auth"
+
 
 class RoomWebSocketHandler(WebSocketHandler):
     """Room websocket handler"""
@@ -12,14 +21,45 @@ class RoomWebSocketHandler(WebSocketHandler):
     def check_origin(self, origin):
         return True
 
+    def get_user_id(self, token: str | None) -> str | None:
+        """
+        Get id of the player from JWT token.
+
+        Token isn't passed in URL, since URLs are written to access logs.
+        """
+        if not token:
+            return None
+        try:
+            return str(decode_jwt_token(token)["user_id"])
+        except (jwt.DecodeError, jwt.ExpiredSignatureError):
+            # connect as spectator
+            return None
+
     async def open(self, *args, **kwargs) -> None:
         self.set_nodelay(True)
+        # player receives own view of game state once authenticated, spectators - public one
+        self.user_id: str | None = None
         if not args:
             return
         if room_id := args[0]:
-            await self.application.socket_manager.add_user_to_room(room_id, self.ws_connection)
+            await self.application.socket_manager.add_user_to_room(room_id, self)
+
+    def on_close(self) -> None:
+        # forget socket right away, don't wait for failed write
+        if self.open_args and (room_id := self.open_args[0]):
+            IOLoop.current().add_callback(
+                self.application.socket_manager.remove_user_from_room, room_id, self
+            )
 
     async def on_message(self, message: str | bytes) -> None:
+        if isinstance(message, str) and message.startswith("{"):
+            try:
+                payload = json_loads(message)
+            except ValueError:
+                payload = None
+            if isinstance(payload, dict) and payload.get("type") == AUTH_MESSAGE_TYPE:
+                self.user_id = self.get_user_id(payload.get("token"))
+                return
         if message and message == "refresh" and self.open_args:
             if room_id := self.open_args[0]:
                 await self.application.socket_manager.broadcast_to_room(room_id, message)
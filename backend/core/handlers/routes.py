@@ -6,12 +6,14 @@ from tornado.web import RequestHandler
 from core.handlers.auth import AuthLoginHandler, AuthSignUpHandler
 from core.handlers.games import GameHandler
 from core.handlers.index import MainHandler
+from core.handlers.metrics import MetricsHandler
 from core.handlers.players import PlayerHandler
 from core.handlers.rooms import (
     GameRoomHandler,
     RoomDataHandler,
     RoomGameTurnHandler,
     RoomHandler,
+    RoomLegalMovesHandler,
     RoomPlayersHandler,
 )
 from core.handlers.rooms_ws import RoomWebSocketHandler
@@ -28,10 +30,12 @@ def get_routes() -> List[Tuple[str, Type[HttpRequestHandler]]]:
         (r"/games/([a-zA-Z0-9_.-]+)/rooms/?", GameRoomHandler),
         (r"/games/([a-zA-Z0-9_.-]+)/?", GameHandler),
         (r"/games/?", GameHandler),
+        (r"/metrics/?", MetricsHandler),
         (r"/players/([a-zA-Z0-9_.-]+)/?", PlayerHandler),
         (r"/rooms/([a-zA-Z0-9_.-]+)/?", RoomHandler),
         (r"/rooms/?", RoomHandler),
         (r"/rooms/([a-zA-Z0-9_.-]+)/data/?", RoomDataHandler),
+        (r"/rooms/([a-zA-Z0-9_.-]+)/data/moves/?", RoomLegalMovesHandler),
         (r"/rooms/([a-zA-Z0-9_.-]+)/turn/?", RoomGameTurnHandler),
         (r"/rooms/([a-zA-Z0-9_.-]+)/players/([a-zA-Z0-9_.-]+)/?", RoomPlayersHandler),
         (r"/rooms/([a-zA-Z0-9_.-]+)/players/?", RoomPlayersHandler),
@@ -1,13 +1,18 @@
 """Loaders"""
+import importlib
 import logging
 import os
+import pkgutil
 
-from typing import Callable
+from typing import Callable, Dict
 
+from tornado.options import options
+
+from core import games
 from core.games.engine import GameEngine
 from core.resources.errors import GameModuleNotFound
-from core.resources.models import Room
-from core.resources.utils import load_module
+from core.resources.models import Game, Room
+from core.types import Id
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -18,25 +23,64 @@ log = logging.getLogger(__name__)
 FACTORY_FUNC_NAME = "create_engine"
 
 
-def load_game_engine_factory(game_name: str) -> Callable | None:
+class EngineRegistry:
     """
-    Load game engine factory function.
+    Registry of game engine factories.
+
+    Engine modules of all game packages (`core/games/<game>/engine.py`) are imported at startup,
+    factories are cached by game name and game id.
     """
-    # lazily load module of the game and cache it in sys.modules
-    module = load_module(f"core.games.{game_name}.engine")
-    if not module:
-        return None
-    try:
-        return getattr(module, FACTORY_FUNC_NAME)
-    except AttributeError:
-        log.error("Can't load game engine builder (%s)", game_name)
-    return None
+
+    def __init__(self) -> None:
+        """Init registry"""
+        # game name (lower case) -> factory
+        self.factories: Dict[str, Callable[..., GameEngine]] = {}
+        # game id -> factory
+        self.game_factories: Dict[str, Callable[..., GameEngine]] = {}
+
+    def discover(self) -> None:
+        """Import engines of all game packages, fail if any of them is broken"""
+        for module_info in pkgutil.iter_modules(games.__path__):
+            if not module_info.ispkg:
+                continue
+            name = module_info.name
+            module = importlib.import_module(f"{games.__name__}.{name}.engine")
+            factory = getattr(module, FACTORY_FUNC_NAME, None)
+            if not callable(factory):
+                raise GameModuleNotFound(f"Can't load game engine builder ({name})")
+            self.factories[name] = factory
+
+    async def load_games(self) -> None:
+        """Map games from db to engine factories, fail if engine of any game is missed"""
+        for game in await Game.all():
+            self.game_factories[str(game.id)] = self.get_factory(game.name)
+
+    def get_factory(self, game_name: str) -> Callable[..., GameEngine]:
+        """Get game engine factory by game name"""
+        try:
+            return self.factories[game_name.lower()]
+        except KeyError:
+            raise GameModuleNotFound(f"Game engine not found ({game_name})")
+
+    async def get_game_factory(self, game_id: Id) -> Callable[..., GameEngine]:
+        """Get game engine factory by game id"""
+        key = str(game_id)
+        if key not in self.game_factories:
+            # game has been added after startup
+            game = await Game.get(id=game_id)
+            self.game_factories[key] = self.get_factory(game.name)
+        return self.game_factories[key]
+
+
+engine_registry = EngineRegistry()
 
 
 async def get_engine(room: Room) -> GameEngine:
-    """Get game engine instance"""
-    name = room.game.name.lower()
-    factory = load_game_engine_factory(name)
-    if not factory:
-        raise GameModuleNotFound
-    return factory(room_id=room.id)
+    """Get game engine instance, game of the room doesn't need to be fetched"""
+    factory = await engine_registry.get_game_factory(room.game_id)  # type: ignore
+    return factory(
+        room_id=room.id,
+        checkpoint_interval=options.game_turn_checkpoint_interval,
+        current_turn_id=room.current_turn_id,
+        state_version=room.state_version,
+    )
@@ -0,0 +1,100 @@
+"""Worker metrics"""
+import time
+
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+
+class RateMeter:
+    """
+    Counts events and their rate per second over sliding window.
+
+    Events are aggregated into one second buckets, so memory doesn't depend on events rate.
+    """
+
+    def __init__(self, window: int = 60) -> None:
+        """Init meter"""
+        self.window = window
+        self.count = 0
+        # [second, number of events]
+        self.buckets: Deque[List[int]] = deque()
+
+    def mark(self, value: int = 1) -> None:
+        """Register events"""
+        now = int(time.monotonic())
+        self.count += value
+        if self.buckets and self.buckets[-1][0] == now:
+            self.buckets[-1][1] += value
+        else:
+            self.buckets.append([now, value])
+        self._expire(now)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values"""
+        return dict(count=self.count, rate=self.rate())
+
+    def rate(self) -> float:
+        """Events per second over the window"""
+        self._expire(int(time.monotonic()))
+        return sum(count for _, count in self.buckets) / self.window
+
+    def _expire(self, now: int) -> None:
+        """Drop buckets out of the window"""
+        while self.buckets and self.buckets[0][0] <= now - self.window:
+            self.buckets.popleft()
+
+
+class TimingMeter:
+    """Keeps the latest timings and their percentiles"""
+
+    def __init__(self, size: int = 1024) -> None:
+        """Init meter"""
+        self.count = 0
+        self.timings: Deque[float] = deque(maxlen=size)
+
+    def observe(self, seconds: float) -> None:
+        """Register timing"""
+        self.count += 1
+        self.timings.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        """Get p-th percentile of the latest timings"""
+        if not self.timings:
+            return 0.0
+        timings = sorted(self.timings)
+        return timings[min(len(timings) - 1, int(round(p / 100 * (len(timings) - 1))))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values, ms"""
+        return dict(
+            count=self.count,
+            p50=self.percentile(50) * 1000,
+            p99=self.percentile(99) * 1000,
+        )
+
+
+class Metrics:
+    """Registry of worker metrics"""
+
+    def __init__(self) -> None:
+        """Init metrics"""
+        self.meters: Dict[str, RateMeter | TimingMeter] = {}
+
+    def meter(self, name: str) -> RateMeter:
+        """Get or create rate meter"""
+        if name not in self.meters:
+            self.meters[name] = RateMeter()
+        return self.meters[name]  # type: ignore
+
+    def timer(self, name: str) -> TimingMeter:
+        """Get or create timing meter"""
+        if name not in self.meters:
+            self.meters[name] = TimingMeter()
+        return self.meters[name]  # type: ignore
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values of all metrics"""
+        return {name: meter.snapshot() for name, meter in self.meters.items()}
+
+
+metrics = Metrics()
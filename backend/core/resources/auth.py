@@ -1,7 +1,10 @@
+import uuid
+
 from datetime import datetime, timedelta
 
 import jwt
 
+from aiocache import caches
 from tornado.options import options
 from tornado_middleware import MiddlewareHandler  # type: ignore
 
@@ -9,9 +12,10 @@ from core.resources.errors import APIError
 from core.resources.models import Player
 
 
-async def get_jwt_token(user_id: str) -> str:
+async def get_jwt_token(user_id: str, name: str | None = None) -> str:
     payload = {
         "user_id": user_id,
+        "name": name,
         "exp": datetime.utcnow() + timedelta(seconds=int(options.JWT_EXP_DELTA_SECONDS)),
     }
 
@@ -19,6 +23,46 @@ async def get_jwt_token(user_id: str) -> str:
     return jwt_token
 
 
+def decode_jwt_token(jwt_token: str) -> dict:
+    """Decode JWT token payload"""
+    return jwt.decode(jwt_token, options.JWT_SECRET, algorithms=[options.JWT_ALGORITHM])
+
+
+async def get_player(user_id: uuid.UUID) -> Player | None:
+    """Get player by id, players are cached in-process for a short time"""
+    cache = caches.get("local")
+    key = f"player_{user_id}"
+    player = await cache.get(key)
+    if player is None:
+        player = await Player.filter(id=user_id).first()
+        if player:
+            await cache.set(key, player, ttl=options.player_cache_ttl)
+    return player
+
+
+class AuthUser:
+    """
+    Authenticated user.
+
+    Id and name are taken from JWT claims, player is fetched only when handler needs it.
+    """
+
+    def __init__(self, id: uuid.UUID, name: str | None = None) -> None:
+        """Init user"""
+        self.id = id
+        self.name = name
+        self.player: Player | None = None
+
+    async def get_player(self) -> Player:
+        """Get player of the user"""
+        if self.player is None:
+            self.player = await get_player(self.id)
+        if self.player is None:
+            # player has been removed
+            raise APIError(401, "Unauthorized")
+        return self.player
+
+
 class JWTAuthMiddleware(MiddlewareHandler):
     """JWT auth middleware"""
 
@@ -28,11 +72,9 @@ class JWTAuthMiddleware(MiddlewareHandler):
         jwt_token = self.request.headers.get("authorization", None)
         if jwt_token:
             try:
-                payload = jwt.decode(
-                    jwt_token, options.JWT_SECRET, algorithms=[options.JWT_ALGORITHM]
-                )
-                self.request.user = await Player.filter(id=payload["user_id"]).first()
-            except (jwt.DecodeError, jwt.ExpiredSignatureError):
+                payload = decode_jwt_token(jwt_token)
+                self.request.user = AuthUser(uuid.UUID(payload["user_id"]), payload.get("name"))
+            except (jwt.DecodeError, jwt.ExpiredSignatureError, KeyError, ValueError):
                 raise APIError(401, "Unauthorized")
         await next()
 
@@ -0,0 +1,119 @@
+"""JSON encoding"""
+import dataclasses
+import json
+
+from datetime import datetime
+from typing import Any, Dict
+from uuid import UUID
+
+from core.resources.serializers import dump_datetime
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def encode_default(value: Any) -> Any:
+    """Convert value unknown to JSON library into JSON-compatible one"""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return dump_datetime(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # DTOs are dumped by own codec
+        asdict = getattr(value, "asdict", None)
+        return asdict() if asdict else dataclasses.asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JSONBackend:
+    """JSON encoder based on standard json module"""
+
+    name = "json"
+
+    def __init__(self) -> None:
+        """Init backend"""
+        self.encoder = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=encode_default
+        )
+
+    def dumps(self, value: Any) -> str:
+        """Encode value into JSON string"""
+        return self.encoder.encode(value)
+
+    def dumps_bytes(self, value: Any) -> bytes:
+        """Encode value into UTF-8 JSON bytes"""
+        return self.encoder.encode(value).encode("utf-8")
+
+    def loads(self, data: str | bytes) -> Any:
+        """Decode JSON"""
+        return json.loads(data)
+
+
+class OrjsonBackend(JSONBackend):
+    """JSON encoder based on orjson, it encodes straight into bytes"""
+
+    name = "orjson"
+    # DTOs are passed to `encode_default`, orjson would dump their internal fields too
+    OPTIONS = (
+        (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z | orjson.OPT_PASSTHROUGH_DATACLASS)
+        if orjson
+        else 0
+    )
+
+    def dumps(self, value: Any) -> str:
+        """Encode value into JSON string"""
+        return self.dumps_bytes(value).decode("utf-8")
+
+    def dumps_bytes(self, value: Any) -> bytes:
+        """Encode value into UTF-8 JSON bytes"""
+        return orjson.dumps(value, default=encode_default, option=self.OPTIONS)
+
+    def loads(self, data: str | bytes) -> Any:
+        """Decode JSON"""
+        return orjson.loads(data)
+
+
+BACKENDS: Dict[str, type[JSONBackend]] = {"json": JSONBackend}
+if orjson:
+    BACKENDS["orjson"] = OrjsonBackend
+
+# backend in use, the fastest available one by default
+json_backend: JSONBackend = BACKENDS.get("orjson", JSONBackend)()
+
+
+def set_json_backend(name: str = "auto") -> JSONBackend:
+    """Select JSON backend by name, `auto` picks the fastest available one"""
+    global json_backend
+    if name == "auto":
+        name = "orjson" if "orjson" in BACKENDS else "json"
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend isn't available ({name})")
+    json_backend = BACKENDS[name]()
+    return json_backend
+
+
+def json_dumps(value: Any) -> str:
+    """Encode value into JSON string"""
+    return json_backend.dumps(value)
+
+
+def json_dumps_bytes(value: Any) -> bytes:
+    """Encode value into UTF-8 JSON bytes"""
+    return json_backend.dumps_bytes(value)
+
+
+def json_encode(value: Any) -> bytes:
+    """
+    Encode value into UTF-8 JSON bytes of HTTP response.
+
+    As `tornado.escape.json_encode` does, "</" is escaped, so user provided strings can't close
+    `<script>` tag if the response is embedded into HTML.
+    """
+    return json_backend.dumps_bytes(value).replace(b"</", b"<\\/")
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Decode JSON"""
+    return json_backend.loads(data)
@@ -1,11 +1,12 @@
 """Error handlers"""
-import json
 import traceback
 
 from typing import Any, Optional
 
 import tornado
 
+from core.resources.encoders import json_encode
+
 
 class AppException(tornado.web.HTTPError):
     """Base App exception class"""
@@ -68,4 +69,4 @@ class ErrorHandler(tornado.web.RequestHandler):
             for line in traceback.format_exception(*kwargs["exc_info"]):
                 lines.append(line)
             data["error"]["traceback"] = lines
-        self.finish(json.dumps(data))
+        self.finish(json_encode(data))
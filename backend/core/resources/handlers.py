@@ -1,10 +1,9 @@
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import tornado
 
-from tornado.escape import json_decode
-
 from core.resources.auth import JWTAuthMiddleware
+from core.resources.encoders import json_encode, json_loads
 from core.resources.errors import ErrorHandler
 
 
@@ -25,7 +24,7 @@ class BaseRequestHandler(JWTAuthMiddleware, ErrorHandler, tornado.web.RequestHan
         """Prepare request"""
         if self.request.body:
             try:
-                json_body = json_decode(self.request.body)
+                json_body = json_loads(self.request.body)
                 self.request.arguments.update(json_body)
             except ValueError:
                 message = "Unable to parse JSON."
@@ -37,3 +36,9 @@ class BaseRequestHandler(JWTAuthMiddleware, ErrorHandler, tornado.web.RequestHan
     async def options(self, *args, **kwargs) -> None:
         """Handle OPTIONS method"""
         pass
+
+    def write(self, chunk: str | bytes | Dict[str, Any] | List[Any]) -> None:
+        """Write response, dicts and lists are encoded with JSON backend in use"""
+        if isinstance(chunk, (dict, list)):
+            chunk = json_encode(chunk)
+        super().write(chunk)
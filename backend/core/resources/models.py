@@ -1,14 +1,11 @@
 """DB models"""
-import json
-
 from tortoise import Model, Tortoise, fields  # mypy: disable-error-code="attr-defined"
 from tortoise.contrib.pydantic import pydantic_model_creator, pydantic_queryset_creator
 
-from core.resources.utils import CustomJSONEncoder
+from core.resources.encoders import json_dumps, json_loads
+from core.resources.serializers import compile_serializer
 from core.types import GameData, Id
 
-JSON_ENCODER = lambda x: json.dumps(x, cls=CustomJSONEncoder)
-
 
 class Player(Model):
     """Player model"""
@@ -47,6 +44,8 @@ class Room(Model):
     )
     closed = fields.DatetimeField(null=True)
     created = fields.DatetimeField(auto_now_add=True)
+    # the latest game turn, maintained by game engine
+    current_turn_id = fields.UUIDField(null=True)
     game: fields.ForeignKeyRelation["Game"] = fields.ForeignKeyField(
         "models.Game", related_name="rooms"
     )
@@ -55,20 +54,31 @@ class Room(Model):
         "models.Player", related_name=""
     )
     size: int = fields.SmallIntField(default=1)
+    # number of the latest game turn
+    state_version: int = fields.IntField(default=0)
     status: int = fields.SmallIntField(default=0)
 
+    class Meta:
+        # room listing by status, the newest first
+        indexes = (("status", "created"),)
+
     class PydanticMeta:
-        exclude = ("gameturns",)
+        exclude = ("gameturns", "current_turn_id")
 
 
 class GameTurn(Model):
     """Temporary model to store game state"""
 
     id: Id = fields.UUIDField(pk=True)
-    data: GameData = fields.JSONField(encoder=JSON_ENCODER)
+    # full game state if checkpoint, otherwise delta from the previous turn
+    checkpoint = fields.BooleanField(default=True)
+    data: GameData = fields.JSONField(encoder=json_dumps, decoder=json_loads)
     room: fields.ForeignKeyRelation[Room] = fields.ForeignKeyField("models.Room")
     turn: int = fields.SmallIntField(default=0)
 
+    class Meta:
+        unique_together = (("room", "turn"),)
+
 
 Tortoise.init_models(["core.resources.models"], "models")
 
@@ -78,3 +88,10 @@ RoomSerializer = pydantic_model_creator(Room)
 RoomListSerializer = pydantic_queryset_creator(Room)
 GameSerializer = pydantic_model_creator(Game)
 GameListSerializer = pydantic_queryset_creator(Game)
+
+# fast serializers of prefetched models
+dump_player = compile_serializer(Player)
+dump_game = compile_serializer(Game)
+dump_room = compile_serializer(
+    Room, related=dict(admin=dump_player, game=dump_game, participants=dump_player)
+)
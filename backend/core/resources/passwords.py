@@ -0,0 +1,69 @@
+"""Password hashing"""
+import asyncio
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Tuple
+
+import bcrypt
+import tornado
+
+from core.metrics import metrics
+from core.resources.errors import APIError
+
+
+class PasswordHasher:
+    """
+    Hashes and checks passwords in dedicated bounded pool of workers.
+
+    bcrypt releases GIL while hashing, so threads hash passwords in parallel without blocking
+    event loop. Requests exceeding `max_queue` pending hashes are rejected with 503 error.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 64) -> None:
+        """Init hasher"""
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor: ThreadPoolExecutor | None = None
+        # number of running and queued hashes
+        self.pending = 0
+
+    async def hash(self, password: str) -> str:
+        """Hash password"""
+        hashed = await self._run(bcrypt.hashpw, tornado.escape.utf8(password), bcrypt.gensalt())
+        return tornado.escape.to_unicode(hashed)
+
+    async def check(self, password: str, hashed: str) -> bool:
+        """Check password against hash"""
+        return await self._run(
+            bcrypt.checkpw, tornado.escape.utf8(password), tornado.escape.utf8(hashed)
+        )
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run hash function in the pool"""
+        if self.pending >= self.workers + self.max_queue:
+            metrics.meter("passwords.rejected").mark()
+            raise APIError(503, "Service is busy, try again later.")
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="passwords")
+        self.pending += 1
+        try:
+            queued = time.perf_counter()
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _timed, func, *args
+            )
+        finally:
+            self.pending -= 1
+        metrics.timer("passwords.queue_wait").observe(started - queued)
+        metrics.timer("passwords.hash_time").observe(finished - started)
+        return result
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> Tuple[Any, float, float]:
+    """Call function, return its result, start and finish time"""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, started, time.perf_counter()
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,62 @@
+"""Model serializers"""
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple, Type
+from uuid import UUID
+
+from tortoise import Model, fields
+
+ModelDumper = Callable[[Model], Dict[str, Any]]
+
+
+def dump_datetime(value: datetime | None) -> str | None:
+    """Dump datetime the same way as pydantic does"""
+    if value is None:
+        return None
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def dump_uuid(value: UUID | None) -> str | None:
+    """Dump UUID"""
+    return None if value is None else str(value)
+
+
+def compile_serializer(
+    model: Type[Model], related: Dict[str, ModelDumper] | None = None
+) -> ModelDumper:
+    """
+    Compile function which dumps model instance into json-compatible dict.
+
+    Output is the same as of model dumped by serializer from `pydantic_model_creator`, but field
+    converters are resolved once and no pydantic models are built per instance. Related models
+    listed in `related` must be fetched beforehand (`select_related`, `prefetch_related`).
+    """
+    related = related or {}
+    exclude = set(getattr(getattr(model, "PydanticMeta", None), "exclude", ()))
+    converters: List[Tuple[str, Callable[[Any], Any] | None]] = []
+    for name in model._meta.fields_db_projection:
+        field = model._meta.fields_map[name]
+        if name in exclude or getattr(field, "reference", None):
+            # foreign key ids are dumped as related models
+            continue
+        if isinstance(field, fields.DatetimeField):
+            converters.append((name, dump_datetime))
+        elif isinstance(field, fields.UUIDField):
+            converters.append((name, dump_uuid))
+        else:
+            converters.append((name, None))
+    many = {name for name in related if name in model._meta.m2m_fields}
+
+    def dump(instance: Model) -> Dict[str, Any]:
+        data = {}
+        for name, convert in converters:
+            value = getattr(instance, name)
+            data[name] = convert(value) if convert else value
+        for name, dump_related in related.items():
+            value = getattr(instance, name)
+            if name in many:
+                data[name] = [dump_related(item) for item in value]
+            else:
+                data[name] = dump_related(value) if value is not None else None
+        return data
+
+    return dump
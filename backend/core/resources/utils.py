@@ -1,21 +1,26 @@
 """Utility functions"""
+import base64
 import importlib
 import json
 import logging
 
-from dataclasses import asdict, is_dataclass
-from uuid import UUID
-
 log = logging.getLogger(__name__)
 
 
-class CustomJSONEncoder(json.JSONEncoder):
-    def default(self, o):
-        if is_dataclass(o):
-            return asdict(o)
-        if isinstance(o, UUID):
-            return str(o)
-        return super().default(o)
+def encode_page_cursor(*values: str) -> str:
+    """Encode values of the last item of the page into opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def decode_page_cursor(cursor: str) -> list:
+    """Decode page cursor into values of the last item of the previous page"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid page cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid page cursor")
+    return values
 
 
 def load_module(module_name: str):
@@ -1,10 +1,17 @@
 """App services"""
+import uuid
+
 from datetime import datetime
+from typing import Any, Dict, List, Tuple
 
-from aiocache import cached
-from tortoise.contrib.pydantic.base import PydanticListModel, PydanticModel
+from aiocache import cached, caches
+from tornado.options import options
+from tortoise.exceptions import DoesNotExist
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
 
-from core.constants import GameRoomStatus
+from core.constants import ROOMS_PAGE_SIZE, GameRoomStatus
+from core.games.executor import turn_executor
 from core.loaders import get_engine
 from core.resources.errors import APIError
 from core.resources.models import (
@@ -14,9 +21,11 @@ from core.resources.models import (
     Player,
     PlayerSerializer,
     Room,
-    RoomListSerializer,
-    RoomSerializer,
+    dump_player,
+    dump_room,
 )
+from core.resources.utils import decode_page_cursor, encode_page_cursor
+from core.types import Id
 
 
 class GameService:
@@ -57,30 +66,78 @@ class RoomService:
             admin=user, game=game, status=GameRoomStatus.CREATED.value, size=size
         )
         await room.participants.add(user)
-        serializer = await RoomSerializer.from_tortoise_orm(room)
-        return serializer.model_dump(mode="json")
+        await self.invalidate_open_rooms(game.id)
+        return dump_room(await self._get_room(room.id))
 
     async def get_available_rooms(
         self,
-    ) -> list[dict]:
-        """Get available rooms"""
-        list_serializer: PydanticListModel = await RoomListSerializer.from_queryset(Room.all())
-        return list_serializer.model_dump(mode="json")
+        status: int | None = GameRoomStatus.CREATED.value,
+        game_id: str | None = None,
+        limit: int = ROOMS_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> dict:
+        """
+        Get page of rooms, the newest first.
+
+        Rooms are paginated by (created, id) of the last room of the previous page. The first
+        page of rooms open to join is cached for a short time.
+        """
+        cache_key = None
+        if status == GameRoomStatus.CREATED.value and not cursor and limit == ROOMS_PAGE_SIZE:
+            cache_key = self._get_open_rooms_cache_key(game_id)
+            cached_page = await caches.get("default").get(cache_key)
+            if cached_page is not None:
+                return cached_page
+
+        queryset = Room.all()
+        if status is not None:
+            queryset = queryset.filter(status=status)
+        if game_id:
+            queryset = queryset.filter(game_id=game_id)
+        if cursor:
+            try:
+                created, room_id = decode_page_cursor(cursor)
+                created, room_id = datetime.fromisoformat(created), uuid.UUID(room_id)
+            except (TypeError, ValueError):
+                raise APIError(400, "Invalid cursor.")
+            queryset = queryset.filter(Q(created__lt=created) | Q(created=created, id__lt=room_id))
+        # one more room to know if there is the next page
+        queryset = queryset.order_by("-created", "-id").limit(limit + 1)
+        rooms = [dump_room(room) for room in await self._prefetch_rooms(queryset)]
+        page: Dict[str, Any] = dict(results=rooms[:limit], next=None)
+        if len(rooms) > limit:
+            last = rooms[limit - 1]
+            page["next"] = encode_page_cursor(last["created"], last["id"])
+
+        if cache_key:
+            await caches.get("default").set(cache_key, page, ttl=options.room_list_cache_ttl)
+        return page
+
+    async def invalidate_open_rooms(self, game_id: Id) -> None:
+        """Drop cached pages of rooms open to join"""
+        cache = caches.get("default")
+        await cache.delete(self._get_open_rooms_cache_key(None))
+        await cache.delete(self._get_open_rooms_cache_key(game_id))
+
+    @staticmethod
+    def _get_open_rooms_cache_key(game_id: Id | None) -> str:
+        """Get cache key of the first page of rooms open to join"""
+        return f"open_rooms_{game_id or 'all'}"
 
     async def get_room_by_id(self, room_id: str) -> dict:
         """Get room details by id"""
-        room = await Room.get(id=room_id).select_related("game")
-        serializer: PydanticModel = await RoomSerializer.from_tortoise_orm(room)
-        return serializer.model_dump(mode="json")
+        return dump_room(await self._get_room(room_id))
 
     async def join_room(self, room_id: str, user) -> dict:
         """Join a room"""
-        room = await Room.get(id=room_id).prefetch_related("participants")
-        if await room.participants.filter(id=user.id).exists():
+        room = await self._get_room(room_id)
+        if any(participant.id == user.id for participant in room.participants):
             raise APIError(400, "User already joined the room.")
         await room.participants.add(user)
-        serializer = await RoomSerializer.from_tortoise_orm(room)
-        return serializer.model_dump(mode="json")
+        await self.invalidate_open_rooms(room.game_id)  # type: ignore
+        data = dump_room(room)
+        data["participants"].append(dump_player(user))
+        return data
 
     async def leave_room(self, room_id: str, user) -> None:
         """Leave a room"""
@@ -99,10 +156,11 @@ class RoomService:
                     "status",
                 )
             )
+        await self.invalidate_open_rooms(room.game_id)  # type: ignore
 
     async def update_room(self, room_id: str, user, data: dict) -> dict:
         """update room"""
-        room = await Room.get(id=room_id).select_related("game")
+        room = await self._get_room(room_id)
         if user.id != room.admin_id:  # type: ignore
             raise APIError(401, "Can't perform this action.")
 
@@ -113,17 +171,33 @@ class RoomService:
             room.size = data["size"]
         if "status" in data:
             status = data["status"]
+            if (
+                status == GameRoomStatus.STARTED.value
+                and room.status != GameRoomStatus.CREATED.value
+            ):
+                # turn log and state version of the room belong to the game being played
+                raise APIError(400, "Game has been already started.")
             room.status = GameRoomStatus(status).value
             if status == GameRoomStatus.STARTED.value:
-                players_ids = list(
-                    map(str, await room.participants.all().values_list("id", flat=True))
-                )
+                players_ids = [str(participant.id) for participant in room.participants]
                 # new game event triggered
                 engine = await get_engine(room)
                 await engine.setup(players_ids)
         await room.save(update_fields=("status", "size"))
-        serializer = await RoomSerializer.from_tortoise_orm(room)
-        return serializer.model_dump(mode="json")
+        await self.invalidate_open_rooms(room.game_id)  # type: ignore
+        return dump_room(room)
+
+    async def _get_room(self, room_id: Id) -> Room:
+        """Get room with admin, game and participants"""
+        rooms = await self._prefetch_rooms(Room.filter(id=room_id))
+        if not rooms:
+            raise DoesNotExist("Object does not exist")
+        return rooms[0]
+
+    @staticmethod
+    async def _prefetch_rooms(queryset: QuerySet[Room]) -> List[Room]:
+        """Get rooms with admin and game (joined) and participants (one more query)"""
+        return await queryset.select_related("admin", "game").prefetch_related("participants")
 
 
 class GameRoomService:
@@ -131,11 +205,17 @@ class GameRoomService:
 
     async def get_game_room_state(self, room_id: str, user_id: str | None) -> dict:
         """Get room game state data"""
-        room = await Room.get(id=room_id).select_related("game")
+        room = await Room.get(id=room_id)
         engine = await get_engine(room)
         # this is public endpoint, user could be missed
         return await engine.poll(user_id)
 
+    async def get_legal_moves(self, room_id: str, user_id: str) -> List[dict]:
+        """Get all valid turns of the player in the latest game state"""
+        room = await Room.get(id=room_id)
+        engine = await get_engine(room)
+        return await engine.legal_moves(user_id)
+
     async def _close_room(self, room_id: str) -> None:
         """Update room status to closed"""
         room = await Room.get(id=room_id)
@@ -148,15 +228,22 @@ class GameRoomService:
             )
         )
 
-    async def make_turn(self, room_id: str, user, turn: dict) -> dict:
-        """Make a game turn"""
-        room = await Room.get(id=room_id).select_related("game")
+    async def make_turn(self, room_id: str, user, turn: dict) -> Tuple[dict, dict]:
+        """Make a game turn, return turn data and game state views of all players"""
+        # turns of the room are applied one by one
+        return await turn_executor.run(room_id, self._make_turn, room_id, user, turn)
+
+    async def _make_turn(self, room_id: str, user, turn: dict) -> Tuple[dict, dict]:
+        """Apply a game turn to the latest game state"""
+        room = await Room.get(id=room_id)
         engine = await get_engine(room)
         # update game state
         data, status = await engine.update(str(user.id), turn)
+        # new game state for every player is prepared once and pushed to players
+        views = await engine.poll_views()
         if not engine.is_in_progress(status):
             await self._close_room(room_id)
-        return data
+        return data, views
 
 
 game_service = GameService()
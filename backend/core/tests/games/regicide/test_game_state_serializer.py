@@ -1,10 +1,14 @@
 """Tests for converter"""
+import json
+
 import pytest
 
+from core.games.regicide.codec import CARDS, STATE_VERSION, decode_cards, encode_cards
 from core.games.regicide.dto import GameStateDto
 from core.games.regicide.game import Regicide as Game
 from core.games.regicide.models import Card, CardRank, Deck, Player, Status, Suit
 from core.games.regicide.serializers import RegicideGameStateDataSerializer
+from core.games.regicide.utils import to_flat_hand
 from core.games.serializers import GameStateDataSerializer
 
 
@@ -36,14 +40,18 @@ class TestRegicideGameStateDataSerializers:
 
         dump = serializer.dumps(game)
 
-        assert [("J", "♠")] == dump["enemy_deck"]
-        assert [("2", "♣")] == dump["tavern_deck"]
+        assert [("J", "♠")] == to_flat_hand(decode_cards(dump["enemy_deck"]))
+        assert [("2", "♣")] == to_flat_hand(decode_cards(dump["tavern_deck"]))
         assert user_id == dump["active_player_id"]
-        assert [(user_id, [("4", "♥")])] == dump["players"]
-        assert [[("5", "♣"), ("A", "♥")], [("3", "♠")]] == dump["played_combos"]
-        assert [("9", "♦")] == dump["discard_deck"]
+        assert [(user_id, "0a")] == dump["players"]
+        assert [("4", "♥")] == to_flat_hand(decode_cards(dump["players"][0][1]))
+        assert [[("5", "♣"), ("A", "♥")], [("3", "♠")]] == [
+            to_flat_hand(decode_cards(combo)) for combo in dump["played_combos"]
+        ]
+        assert [("9", "♦")] == to_flat_hand(decode_cards(dump["discard_deck"]))
         assert 5 == dump["turn"]
         assert Status.DISCARDING_CARDS.value == dump["status"]
+        assert STATE_VERSION == dump["version"]
 
     def test_load_data(self, serializer) -> None:
         """Tests loading game data"""
@@ -86,3 +94,34 @@ class TestRegicideGameStateDataSerializers:
         assert CardRank.THREE == game.played_combos[1][0].rank
 
         # TODO: check players' hands
+
+    def test_dump_load_round_trip(self, serializer) -> None:
+        """Tests game is loaded from compact state the same as from legacy one"""
+        game = Game.init_new_game(["user1_id", "user2_id"])
+        legacy = GameStateDto(
+            enemy_deck=to_flat_hand(game.enemy_deck.cards),
+            discard_deck=to_flat_hand(game.discard_deck.cards),
+            active_player_id=game.active_player.id,
+            players=[(pl.id, to_flat_hand(pl.hand)) for pl in game.players],
+            played_combos=[to_flat_hand(combo) for combo in game.played_combos],
+            status=game.status.value,  # type: ignore
+            tavern_deck=to_flat_hand(game.tavern_deck.cards),
+            turn=game.turn,
+        )
+        dump = serializer.dumps(game)
+
+        assert serializer.dumps(serializer.loads(legacy)) == serializer.dumps(
+            serializer.loads(GameStateDto(**dump))
+        )
+        # several times smaller
+        assert len(json.dumps(legacy.asdict())) > 3 * len(json.dumps(dump))
+
+
+class TestCardCodec:
+    """unit tests for card codec"""
+
+    def test_all_cards_encoded(self) -> None:
+        """Tests every card has own code"""
+        assert 52 == len(CARDS)
+        assert bytes(range(52)).hex() == encode_cards(CARDS)
+        assert list(CARDS) == decode_cards(encode_cards(CARDS))
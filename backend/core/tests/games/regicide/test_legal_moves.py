@@ -0,0 +1,105 @@
+"""Tests for legal moves generator"""
+import itertools
+import random
+
+from typing import List
+
+import pytest
+
+from core.games.regicide import game as game_module, models as models_module
+from core.games.regicide.game import (
+    Regicide,
+    get_discard_combos,
+    get_enemy_attack_damage,
+    get_play_combos,
+    legal_moves,
+    validate_game_turn,
+)
+from core.games.regicide.models import Card, Status
+from core.games.regicide.utils import to_flat_hand
+from core.resources.errors import Error
+from core.types import GameDataTurn
+
+
+def get_valid_turns(game: Regicide) -> List[GameDataTurn]:
+    """All turns of active player accepted by validation"""
+    player = game.active_player
+    turns = [{"cards": []}] if game.is_playing_cards_state else []
+    for size in range(1, len(player.hand) + 1):
+        for cards in itertools.combinations(to_flat_hand(player.hand), size):
+            try:
+                validate_game_turn(game, player.id, {"cards": list(cards)})
+            except Error:
+                continue
+            turns.append({"cards": list(cards)})
+    return turns
+
+
+def as_set(turns: List[GameDataTurn]) -> set:
+    """Turns as comparable set"""
+    return {frozenset(map(tuple, turn["cards"])) for turn in turns}
+
+
+def get_attack(turn: GameDataTurn) -> int:
+    """Attack of turn cards"""
+    return Card.get_combo_damage([Card(rank, suit) for rank, suit in turn["cards"]])
+
+
+@pytest.fixture
+def rng(monkeypatch) -> random.Random:
+    """Seeded generator, games shuffle decks with it instead of the global one"""
+    rng = random.Random(7)
+    monkeypatch.setattr(game_module, "random", rng)
+    monkeypatch.setattr(models_module, "random", rng)
+    return rng
+
+
+class TestLegalMoves:
+    """Test cases for legal moves"""
+
+    def test_play_combos(self) -> None:
+        """Tests singles, ace companions and same rank combos"""
+        hand = [Card("2", "♣"), Card("2", "♥"), Card("2", "♠"), Card("A", "♦"), Card("A", "♣")]
+        combos = {frozenset(combo) for combo in get_play_combos(hand)}
+        assert len(combos) == len(get_play_combos(hand))
+        assert {frozenset([card]) for card in hand} < combos
+        assert frozenset([Card("A", "♦"), Card("A", "♣")]) in combos
+        assert frozenset([Card("A", "♦"), Card("2", "♠")]) in combos
+        assert frozenset([Card("2", "♣"), Card("2", "♥"), Card("2", "♠")]) in combos
+        assert len(combos) == 5 + 7 + 4
+
+    def test_discard_combos_are_minimal(self) -> None:
+        """Tests every discard set is enough and has no redundant card"""
+        hand = [Card("K", "♣"), Card("9", "♥"), Card("5", "♠"), Card("3", "♦"), Card("A", "♣")]
+        combos = get_discard_combos(hand, 14)
+        assert {frozenset(combo) for combo in combos} == {
+            frozenset([Card("K", "♣")]),
+            frozenset([Card("9", "♥"), Card("5", "♠")]),
+        }
+        assert get_discard_combos(hand, 100) == []
+        assert len(get_discard_combos(hand, 0)) == len(hand)
+
+    def test_matches_validation(self, rng: random.Random) -> None:
+        """Tests generated moves are exactly valid turns (discards - minimal valid ones)"""
+        for _ in range(30):
+            game = Regicide.init_new_game(["user1", "user2"])
+            while game.is_game_in_progress:
+                player_id = game.active_player.id
+                moves = legal_moves(game, player_id)
+                valid = get_valid_turns(game)
+                if game.is_playing_cards_state:
+                    assert as_set(moves) == as_set(valid)
+                else:
+                    damage = get_enemy_attack_damage(game.current_enemy, game.played_combos)
+                    minimal = [
+                        turn
+                        for turn in valid
+                        if all(
+                            get_attack(turn) - Card(*card).attack < damage for card in turn["cards"]
+                        )
+                    ]
+                    assert as_set(moves) == as_set(minimal)
+                assert legal_moves(game, "user3") == []
+                game.make_turn(player_id, rng.choice(moves))
+            assert game.status in (Status.WON, Status.LOST)
+            assert legal_moves(game, game.active_player.id) == []
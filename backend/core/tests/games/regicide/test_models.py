@@ -0,0 +1,124 @@
+"""Tests for game models"""
+import copy
+import pickle
+
+import pytest
+
+from core.games.regicide.codec import CARDS
+from core.games.regicide.models import Card, CardRank, Deck, Player, Suit, cards_mask, has_suit
+
+
+class TestCard:
+    """Test cases for interned cards"""
+
+    def test_cards_are_interned(self) -> None:
+        """Tests the same instance is returned for any form of rank and suit"""
+        card = Card(CardRank.TEN, Suit.HEARTS)
+        assert Card("10", "♥") is card
+        assert Card(rank="10", suit=Suit.HEARTS) is card
+        assert copy.deepcopy(card) is card
+        assert pickle.loads(pickle.dumps(card)) is card
+        assert len({Card(rank, suit) for rank in CardRank for suit in Suit}) == 52
+
+    def test_invalid_card(self) -> None:
+        """Tests unknown rank or suit raises ValueError"""
+        with pytest.raises(ValueError):
+            Card("1", "♥")
+        with pytest.raises(ValueError):
+            Card("10", "x")
+
+    def test_card_is_immutable(self) -> None:
+        """Tests card attributes can't be changed"""
+        card = Card("2", "♣")
+        with pytest.raises(AttributeError):
+            card.rank = CardRank.ACE
+        with pytest.raises(AttributeError):
+            card.color = "black"
+
+    def test_precomputed_values(self) -> None:
+        """Tests attack, health and code of cards"""
+        assert (Card("A", "♠").attack, Card("A", "♠").health) == (1, 0)
+        assert (Card("K", "♦").attack, Card("K", "♦").health) == (20, 40)
+        assert [card.code for card in CARDS] == list(range(52))
+        assert Card("2", "♣").suit_flag != Card("2", "♦").suit_flag
+
+    def test_ordering(self) -> None:
+        """Tests cards are ordered by rank and then by suit symbol"""
+        cards = [Card(rank, suit) for rank in CardRank for suit in Suit]
+        expected = sorted(
+            cards,
+            key=lambda c: (Card.FACE_CARD_RANKS.get(c.rank) or int(c.rank.value), c.suit.value),
+        )
+        assert sorted(reversed(cards)) == expected
+        assert Card("10", "♠") < Card("J", "♠") < Card("A", "♣")
+        assert Card("5", "♥") > Card("5", "♣")
+
+    def test_equal_to_pair(self) -> None:
+        """Tests card is equal to (rank, suit) pair"""
+        assert Card("J", "♥") == ("J", "♥")
+        assert Card("J", "♥") == [CardRank.JACK, Suit.HEARTS]
+        assert Card("J", "♥") != ("Q", "♥")
+        assert Card("J", "♥") != ("X", "♥")
+
+
+class TestPlayer:
+    """Test cases for player"""
+
+    def test_remove_cards_from_hand(self) -> None:
+        """Tests played cards are removed from sorted hand"""
+        hand = [Card("7", "♦"), Card("2", "♣"), Card("A", "♠"), Card("7", "♣")]
+        player = Player("user", hand)
+        player.remove_cards_from_hand([Card("7", "♣"), Card("2", "♣")])
+        assert player.hand == [Card("7", "♦"), Card("A", "♠")]
+        assert player.hand_mask == cards_mask(player.hand)
+
+    def test_hand_mask(self) -> None:
+        """Tests hand bitmask follows hand changes"""
+        player = Player("user", [Card("7", "♦"), Card("2", "♣")])
+        assert player.has_cards([Card("2", "♣")])
+        assert not player.has_cards([Card("2", "♣"), Card("3", "♣")])
+        player.add_card(Card("3", "♣"))
+        assert player.has_cards([Card("2", "♣"), Card("3", "♣")])
+        player.remove_cards_from_hand([Card("K", "♠")])
+        assert len(player.hand) == 3
+        player.hand = [Card("K", "♠")]
+        assert player.hand_mask == Card("K", "♠").bit
+
+    def test_has_suit(self) -> None:
+        """Tests suit presence in cards and bitmask of cards"""
+        cards = [Card("7", "♦"), Card("2", "♣")]
+        assert has_suit(cards, Suit.DIAMONDS)
+        assert not has_suit(cards, Suit.HEARTS)
+        assert has_suit(cards_mask(cards), Suit.CLUBS)
+        assert not has_suit(Player("user", cards).hand_mask, Suit.SPADES)
+
+
+class TestDeck:
+    """Test cases for card deck"""
+
+    def test_draw_and_append(self) -> None:
+        """Tests cards are drawn from the top and appended to the bottom"""
+        cards = CARDS[:6]
+        deck = Deck(cards[:4])
+        assert deck.peek() is cards[0]
+        assert deck.pop() is cards[0]
+        assert deck.pop_many(2) == list(cards[1:3])
+        deck.append(cards[4])
+        deck.append(list(cards[5:]))
+        assert list(deck.cards) == [cards[3], cards[4], cards[5]]
+        assert len(deck) == 3
+        assert deck.clear() == 3
+        assert deck.peek() is None
+        assert not len(deck)
+
+    def test_pop_too_many(self) -> None:
+        """Tests can't pop more cards than deck contains"""
+        with pytest.raises(AssertionError):
+            Deck(CARDS[:2]).pop_many(3)
+
+    def test_shuffle(self) -> None:
+        """Tests shuffle keeps the same cards"""
+        deck = Deck(CARDS)
+        deck.shuffle()
+        assert len(deck) == 52
+        assert sorted(deck.cards) == sorted(CARDS)
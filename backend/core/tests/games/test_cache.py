@@ -0,0 +1,53 @@
+"""Unit tests for game state cache"""
+import pytest
+
+from core.games.cache import GameStateCache
+
+ROOM1_ID = "room1"
+ROOM2_ID = "room2"
+ROOM3_ID = "room3"
+
+
+@pytest.fixture
+def cache():
+    return GameStateCache(maxsize=2)
+
+
+class TestGameStateCache:
+    """Test cases for game state cache"""
+
+    def test_least_recently_used_game_evicted(self, cache: GameStateCache) -> None:
+        """Tests cache keeps only recently used games"""
+        cache.set(ROOM1_ID, 1, "game1", {"turn": 1})
+        cache.set(ROOM2_ID, 1, "game2", {"turn": 1})
+        # mark first room as recently used
+        assert cache.get(ROOM1_ID)
+        cache.set(ROOM3_ID, 1, "game3", {"turn": 1})
+
+        assert (1, "game1", {"turn": 1}) == cache.get(ROOM1_ID)
+        assert cache.get(ROOM2_ID) is None
+        assert cache.get(ROOM3_ID)
+
+    def test_older_turn_not_cached(self, cache: GameStateCache) -> None:
+        """Tests cache doesn't replace newer game state"""
+        cache.set(ROOM1_ID, 5, "game5", {"turn": 5})
+        cache.set(ROOM1_ID, 4, "game4", {"turn": 4})
+
+        assert 5 == cache.get(ROOM1_ID)[0]  # type: ignore
+
+    def test_invalidate(self, cache: GameStateCache) -> None:
+        """Tests invalidation of outdated games"""
+        cache.set(ROOM1_ID, 5, "game", {"turn": 5})
+
+        cache.invalidate(ROOM1_ID, 5)
+        assert cache.get(ROOM1_ID)
+
+        cache.invalidate(ROOM1_ID, 6)
+        assert cache.get(ROOM1_ID) is None
+
+    def test_pop(self, cache: GameStateCache) -> None:
+        """Tests taking game out of cache"""
+        cache.set(ROOM1_ID, 1, "game", {"turn": 1})
+
+        assert (1, "game", {"turn": 1}) == cache.pop(ROOM1_ID)
+        assert cache.pop(ROOM1_ID) is None
@@ -0,0 +1,72 @@
+"""Unit tests for game turn executor"""
+import asyncio
+
+import pytest
+
+from core.games.exceptions import TurnConflictError
+from core.games.executor import TurnExecutor
+
+ROOM1_ID = "room1"
+ROOM2_ID = "room2"
+
+
+@pytest.fixture
+def executor():
+    return TurnExecutor(retries=2)
+
+
+class TestTurnExecutor:
+    """Test cases for turn executor"""
+
+    def test_room_turns_applied_one_by_one(self, executor: TurnExecutor) -> None:
+        """Tests turns of the same room don't overlap"""
+        events = []
+
+        async def make_turn(room_id: str, turn: int) -> int:
+            events.append(("start", room_id, turn))
+            await asyncio.sleep(0.01)
+            events.append(("end", room_id, turn))
+            return turn
+
+        async def run() -> list:
+            return await asyncio.gather(
+                executor.run(ROOM1_ID, make_turn, ROOM1_ID, 1),
+                executor.run(ROOM1_ID, make_turn, ROOM1_ID, 2),
+                executor.run(ROOM2_ID, make_turn, ROOM2_ID, 1),
+            )
+
+        assert [1, 2, 1] == asyncio.run(run())
+        room1_events = [e for e in events if e[1] == ROOM1_ID]
+        assert [
+            ("start", ROOM1_ID, 1),
+            ("end", ROOM1_ID, 1),
+            ("start", ROOM1_ID, 2),
+            ("end", ROOM1_ID, 2),
+        ] == room1_events
+        # another room doesn't wait for the first room
+        assert ("start", ROOM2_ID, 1) == events[1]
+        assert not executor.locks
+        assert not executor.waiters
+
+    def test_conflicting_turn_retried(self, executor: TurnExecutor) -> None:
+        """Tests turn is retried on conflict"""
+        attempts = []
+
+        async def make_turn() -> str:
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise TurnConflictError
+            return "ok"
+
+        assert "ok" == asyncio.run(executor.run(ROOM1_ID, make_turn))
+        assert 3 == len(attempts)
+
+    def test_conflicting_turn_retries_exceeded(self, executor: TurnExecutor) -> None:
+        """Tests conflict error raised after all retries"""
+
+        async def make_turn() -> None:
+            raise TurnConflictError
+
+        with pytest.raises(TurnConflictError):
+            asyncio.run(executor.run(ROOM1_ID, make_turn))
+        assert not executor.locks
@@ -0,0 +1,141 @@
+"""Unit tests for game turn log"""
+import asyncio
+import json
+import random
+
+from core.games.cache import game_state_cache
+from core.games.regicide import game as regicide_game
+from core.games.regicide.dto import GameStateDto
+from core.games.regicide.engine import create_engine
+from core.games.regicide.game import Regicide, legal_moves
+from core.games.regicide.models import Status, Suit
+from core.games.regicide.serializers import RegicideGameStateDataSerializer
+from core.games.turn_log import apply_delta, is_checkpoint_turn, make_delta, restore_state
+from core.resources.models import Game, Player, Room
+from core.tests.utils import QueryCounter, run_with_db
+
+CLUBS = Suit.CLUBS.value
+HEARTS = Suit.HEARTS.value
+SPADES = Suit.SPADES.value
+DIAMONDS = Suit.DIAMONDS.value
+
+USER1_ID = "user1"
+USER2_ID = "user2"
+
+
+def load_from_db(state: dict) -> dict:
+    """Emulate JSONB round trip"""
+    return json.loads(json.dumps(state))
+
+
+class TestTurnLog:
+    """Test cases for turn log"""
+
+    def test_is_checkpoint_turn(self) -> None:
+        """Tests checkpoint turns"""
+        assert is_checkpoint_turn(7, 1)
+        assert is_checkpoint_turn(7, 0)
+        assert is_checkpoint_turn(10, 5)
+        assert not is_checkpoint_turn(11, 5)
+
+    def test_delta_contains_changed_fields_only(self) -> None:
+        """Tests delta keeps only changed fields and turn input"""
+        previous = load_from_db({"board": [None, "a"], "turn": 1, "status": "in_progress"})
+        state = {"board": (None, "a"), "turn": 2, "status": "in_progress"}
+
+        delta = make_delta(previous, state, {"index": 1})
+
+        assert {"input": {"index": 1}, "diff": {"turn": 2}} == delta
+        assert load_from_db(state) == apply_delta(previous, delta)
+
+    def test_delta_of_nested_values(self) -> None:
+        """Tests changed list items are stored by path, long lists and strings as splices"""
+        previous = load_from_db(
+            {
+                "players": [["user1", "0102030405"], ["user2", "0a0b"]],
+                "deck": "11121314151617",
+                "board": [None, None, None],
+            }
+        )
+        state = {
+            "players": [("user1", "01020405"), ("user2", "0a0b")],
+            "deck": "1314151617",
+            "board": [None, "x", None],
+        }
+
+        delta = make_delta(previous, state)
+
+        assert {"board/1": "x"} == delta["diff"]
+        assert {"players/0/1": [5, 7, ""], "deck": [1, 5, ""]} == delta["splice"]
+        assert load_from_db(state) == apply_delta(previous, load_from_db(delta))
+        # previous state isn't changed
+        assert "0102030405" == previous["players"][0][1]
+
+    def test_restore_regicide_state(self) -> None:
+        """Tests rebuilding regicide state from checkpoint and deltas"""
+        serializer = RegicideGameStateDataSerializer
+        dump = GameStateDto(
+            enemy_deck=[("Q", DIAMONDS), ("K", CLUBS)],
+            discard_deck=[("4", CLUBS)],
+            active_player_id=USER1_ID,
+            players=[
+                (USER1_ID, [("5", CLUBS), ("10", SPADES), ("K", DIAMONDS), ("A", DIAMONDS)]),
+                (USER2_ID, [("3", CLUBS), ("7", HEARTS)]),
+            ],
+            played_combos=[[("4", SPADES)]],
+            status=Status.PLAYING_CARDS.value,
+            tavern_deck=[("4", HEARTS), ("9", CLUBS), ("8", SPADES)],
+            turn=6,
+        )
+        game = serializer.loads(dump)
+        checkpoint = load_from_db(serializer.dumps(game))
+
+        deltas = []
+        previous = checkpoint
+        for turn in ({"cards": [("5", CLUBS), ("A", DIAMONDS)]}, {"cards": [("K", DIAMONDS)]}):
+            game = game.make_turn(game.active_player.id, turn)
+            state = serializer.dumps(game)
+            delta = load_from_db(make_delta(previous, state, turn))
+            assert "enemy_deck" not in delta["diff"]
+            deltas.append(delta)
+            previous = load_from_db(state)
+
+        assert load_from_db(serializer.dumps(game)) == restore_state(checkpoint, deltas)
+
+
+class TestTurnLogStorage:
+    """Test cases for game state stored as turn log"""
+
+    def test_latest_state_single_query(self, monkeypatch) -> None:
+        """Tests the latest state is restored from checkpoint and deltas by one query"""
+        # games shuffle decks with seeded generator instead of the global one
+        rng = random.Random(3)
+        monkeypatch.setattr(regicide_game, "random", rng)
+
+        async def run() -> None:
+            player = await Player.create(email="p1@test.com", name="p1", password="-")
+            game = await Game.create(name="Regicide", min_size=1, max_size=4)
+            room = await Room.create(admin=player, game=game)
+            engine = create_engine(room_id=room.id, checkpoint_interval=3)
+            await engine.setup([USER1_ID, USER2_ID])
+            regicide: Regicide = (await engine.load_game())[0]
+            while regicide.is_game_in_progress and engine.state_version < 7:
+                player_id = regicide.active_player.id
+                await engine.update(player_id, rng.choice(legal_moves(regicide, player_id)))
+                regicide = (await engine.load_game())[0]
+            assert 7 == engine.state_version
+
+            room = await Room.get(id=room.id)
+            engine = create_engine(
+                room_id=room.id, checkpoint_interval=3, state_version=room.state_version
+            )
+            with QueryCounter() as counter:
+                state = await engine.get_game_data()
+            assert 1 == len(counter.queries)
+            assert load_from_db(RegicideGameStateDataSerializer.dumps(regicide)) == state
+            assert 7 == state["turn"]
+
+        try:
+            asyncio.run(run_with_db(run))
+        finally:
+            game_state_cache.clear()
@@ -0,0 +1,51 @@
+"""Unit tests for JWT auth"""
+import asyncio
+import types
+import uuid
+
+import pytest
+
+from aiocache import caches
+
+from core.resources import auth
+from core.resources.auth import AuthUser
+from core.resources.errors import APIError
+from core.resources.models import Player
+from core.tests.utils import run_with_db
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(auth, "options", types.SimpleNamespace(player_cache_ttl=30))
+    # in-memory caches, config and cache instances are restored after the test
+    local = {"cache": "aiocache.SimpleMemoryCache"}
+    monkeypatch.setattr(caches, "_caches", {})
+    monkeypatch.setattr(caches, "_config", {"default": local, "local": local})
+
+
+class TestAuthUser:
+    """Test cases for authenticated user"""
+
+    def test_player_fetched_once(self) -> None:
+        """Tests player is fetched from db on demand and then taken from cache"""
+
+        async def run() -> None:
+            player = await Player.create(email="p1@test.com", name="p1", password="-")
+            user = AuthUser(player.id, "p1")
+            assert user.player is None
+
+            assert player.id == (await user.get_player()).id
+            await Player.filter(id=player.id).update(name="p2")
+            # another request of the same user
+            assert "p1" == (await AuthUser(player.id).get_player()).name
+
+        asyncio.run(run_with_db(run))
+
+    def test_removed_player(self) -> None:
+        """Tests removed player is unauthorized"""
+
+        async def run() -> None:
+            with pytest.raises(APIError):
+                await AuthUser(uuid.uuid4()).get_player()
+
+        asyncio.run(run_with_db(run))
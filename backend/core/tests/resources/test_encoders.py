@@ -0,0 +1,59 @@
+"""Tests for JSON encoders"""
+import uuid
+
+from datetime import datetime, timezone
+
+import pytest
+
+from core.games.regicide.dto import PlayerHand
+from core.resources import encoders
+
+
+@pytest.fixture(params=sorted(encoders.BACKENDS))
+def backend(request, monkeypatch) -> encoders.JSONBackend:
+    """Every available JSON backend"""
+    backend = encoders.BACKENDS[request.param]()
+    monkeypatch.setattr(encoders, "json_backend", backend)
+    return backend
+
+
+class TestJSONBackend:
+    """Test cases for JSON backends"""
+
+    def test_encode_special_types(self, backend: encoders.JSONBackend) -> None:
+        """Tests UUIDs, datetimes and DTOs are encoded"""
+        value = {
+            "id": uuid.UUID("6f0f4b4e-7c3e-4a54-9d1c-1f1d7e1ab4e2"),
+            "created": datetime(2026, 10, 17, 12, 30, 5, 123456, tzinfo=timezone.utc),
+            "hand": PlayerHand(id="user1", size=1, hand=[("A", "♦")]),
+        }
+        data = encoders.json_dumps_bytes(value)
+        assert isinstance(data, bytes)
+        assert encoders.json_loads(data) == {
+            "id": "6f0f4b4e-7c3e-4a54-9d1c-1f1d7e1ab4e2",
+            "created": "2026-10-17T12:30:05.123456Z",
+            "hand": {"id": "user1", "size": 1, "hand": [["A", "♦"]]},
+        }
+        assert encoders.json_dumps(value) == data.decode("utf-8")
+
+    def test_encode_html_safe(self, backend: encoders.JSONBackend) -> None:
+        """Tests response JSON can't close script tag"""
+        value = {"name": "</script><script>alert(1)</script>"}
+        data = encoders.json_encode(value)
+        assert b"</" not in data
+        assert b"<\\/script>" in data
+        assert value == encoders.json_loads(data)
+
+    def test_encode_unknown_type(self, backend: encoders.JSONBackend) -> None:
+        """Tests unknown types aren't encoded silently"""
+        with pytest.raises(TypeError):
+            encoders.json_dumps({"value": object()})
+
+    def test_set_json_backend(self, monkeypatch) -> None:
+        """Tests backend is selected by name"""
+        monkeypatch.setattr(encoders, "json_backend", encoders.json_backend)
+        assert encoders.set_json_backend("json").name == "json"
+        assert encoders.json_backend.name == "json"
+        assert encoders.set_json_backend().name == ("orjson" if encoders.orjson else "json")
+        with pytest.raises(ValueError):
+            encoders.set_json_backend("simplejson")
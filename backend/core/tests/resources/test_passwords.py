@@ -0,0 +1,48 @@
+"""Unit tests for password hashing"""
+import asyncio
+
+import bcrypt
+import pytest
+
+from core.metrics import metrics
+from core.resources.errors import APIError
+from core.resources.passwords import PasswordHasher
+
+GENSALT = bcrypt.gensalt
+
+
+@pytest.fixture(autouse=True)
+def fast_bcrypt(monkeypatch):
+    # the cheapest hashing
+    monkeypatch.setattr(bcrypt, "gensalt", lambda: GENSALT(4))
+
+
+class TestPasswordHasher:
+    """Test cases for password hasher"""
+
+    def test_hash_and_check(self) -> None:
+        """Tests hashed password is checked"""
+        hasher = PasswordHasher(workers=2)
+
+        async def run() -> None:
+            hashed = await hasher.hash("secret")
+            assert await hasher.check("secret", hashed)
+            assert not await hasher.check("wrong", hashed)
+
+        asyncio.run(run())
+        assert 0 == hasher.pending
+        assert metrics.timer("passwords.hash_time").count >= 3
+
+    def test_saturated_pool_rejects(self) -> None:
+        """Tests hashes over queue limit are rejected"""
+        hasher = PasswordHasher(workers=1, max_queue=1)
+
+        async def run() -> list:
+            return await asyncio.gather(
+                *(hasher.hash("secret") for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        errors = [r for r in results if isinstance(r, APIError)]
+        assert 1 == len(errors)
+        assert 503 == errors[0].status_code
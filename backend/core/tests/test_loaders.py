@@ -0,0 +1,57 @@
+"""Unit tests for game engine loaders"""
+import asyncio
+import types
+
+import pytest
+
+from core import loaders
+from core.games.regicide.engine import RegicideGameEngine
+from core.games.tictactoe.engine import TicTacToeGameEngine
+from core.loaders import EngineRegistry, get_engine
+from core.resources.errors import GameModuleNotFound
+from core.resources.models import Game, Player, Room
+from core.tests.utils import QueryCounter, run_with_db
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = EngineRegistry()
+    registry.discover()
+    monkeypatch.setattr(loaders, "engine_registry", registry)
+    monkeypatch.setattr(loaders, "options", types.SimpleNamespace(game_turn_checkpoint_interval=10))
+    return registry
+
+
+class TestEngineRegistry:
+    """Test cases for game engine registry"""
+
+    def test_discover(self, registry: EngineRegistry) -> None:
+        """Tests engines of all games are discovered"""
+        assert {"regicide", "tictactoe"} == set(registry.factories)
+        assert isinstance(registry.get_factory("Regicide")(room_id="room"), RegicideGameEngine)
+        with pytest.raises(GameModuleNotFound):
+            registry.get_factory("Chess")
+
+    def test_engine_without_game_query(self, registry: EngineRegistry) -> None:
+        """Tests game of the room is not fetched to create engine"""
+
+        async def run() -> None:
+            player = await Player.create(email="p1@test.com", name="p1", password="-")
+            game = await Game.create(name="TicTacToe", min_size=2, max_size=2)
+            chess = await Game.create(name="Chess", min_size=2, max_size=2)
+            room = await Room.create(admin=player, game=game, state_version=3)
+
+            # game without engine fails startup
+            with pytest.raises(GameModuleNotFound):
+                await registry.load_games()
+            await chess.delete()
+            await registry.load_games()
+
+            room = await Room.get(id=room.id)
+            with QueryCounter() as counter:
+                engine = await get_engine(room)
+            assert not counter.queries
+            assert isinstance(engine, TicTacToeGameEngine)
+            assert 3 == engine.state_version
+
+        asyncio.run(run_with_db(run))
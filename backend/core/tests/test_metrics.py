@@ -0,0 +1,46 @@
+"""Unit tests for worker metrics"""
+from core.metrics import Metrics, RateMeter, TimingMeter
+
+
+class TestRateMeter:
+    """Test cases for rate meter"""
+
+    def test_rate_over_window(self, monkeypatch) -> None:
+        """Tests rate counts only events within window"""
+        now = [100.0]
+        monkeypatch.setattr("core.metrics.time.monotonic", lambda: now[0])
+        meter = RateMeter(window=10)
+
+        meter.mark()
+        meter.mark(4)
+        now[0] = 105.5
+        meter.mark(5)
+        assert 1.0 == meter.rate()
+        assert 2 == len(meter.buckets)
+
+        now[0] = 110.0
+        assert 0.5 == meter.rate()
+        assert 10 == meter.count
+
+    def test_snapshot(self) -> None:
+        """Tests snapshot contains all meters"""
+        metrics = Metrics()
+        metrics.meter("wakeups").mark()
+
+        assert {"wakeups": {"count": 1, "rate": 1 / 60}} == metrics.snapshot()
+
+
+class TestTimingMeter:
+    """Test cases for timing meter"""
+
+    def test_percentiles(self) -> None:
+        """Tests percentiles of the latest timings"""
+        meter = TimingMeter(size=100)
+        for ms in range(1, 201):
+            meter.observe(ms / 1000)
+
+        snapshot = meter.snapshot()
+        assert 200 == snapshot["count"]
+        # only the latest 100 timings are kept
+        assert 151 == round(snapshot["p50"])
+        assert 199 == round(snapshot["p99"])
@@ -0,0 +1,193 @@
+"""Unit tests for app services"""
+import asyncio
+import types
+
+import pytest
+
+from aiocache import caches
+
+from core import loaders, services
+from core.constants import GameRoomStatus
+from core.games.cache import game_state_cache
+from core.loaders import engine_registry, get_engine
+from core.resources.errors import APIError
+from core.resources.models import Game, GameTurn, Player, Room, RoomSerializer
+from core.services import game_room_service, room_service
+from core.tests.utils import QueryCounter, run_with_db
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(services, "options", types.SimpleNamespace(room_list_cache_ttl=30))
+    # in-memory caches, config and cache instances are restored after the test
+    local = {"cache": "aiocache.SimpleMemoryCache"}
+    monkeypatch.setattr(caches, "_caches", {})
+    monkeypatch.setattr(caches, "_config", {"default": local, "local": local})
+
+
+async def create_rooms(number: int, status: int = GameRoomStatus.CREATED.value) -> list:
+    """Create rooms, the newest last"""
+    player, _ = await Player.get_or_create(email="p1@test.com", name="p1", password="-")
+    game, _ = await Game.get_or_create(name="Game", defaults=dict(min_size=1, max_size=4))
+    return [
+        await Room.create(admin=player, game=game, status=status, size=1) for _ in range(number)
+    ]
+
+
+class TestRoomList:
+    """Test cases for room listing"""
+
+    def test_pages(self) -> None:
+        """Tests rooms are listed page by page, the newest first"""
+
+        async def run() -> None:
+            rooms = await create_rooms(5)
+            await create_rooms(2, GameRoomStatus.FINISHED.value)
+
+            page = await room_service.get_available_rooms(limit=2)
+            ids = [room["id"] for room in page["results"]]
+            while page["next"]:
+                page = await room_service.get_available_rooms(limit=2, cursor=page["next"])
+                ids.extend(room["id"] for room in page["results"])
+
+            # rooms created at the same time are ordered by id
+            rooms.sort(key=lambda room: (room.created, room.id), reverse=True)
+            assert [str(room.id) for room in rooms] == ids
+
+        asyncio.run(run_with_db(run))
+
+    def test_filters(self) -> None:
+        """Tests rooms are filtered by status and game"""
+
+        async def run() -> None:
+            await create_rooms(1)
+            finished = await create_rooms(2, GameRoomStatus.FINISHED.value)
+            other_game = await Game.create(name="Other", min_size=1, max_size=2)
+            await Room.create(admin_id=finished[0].admin_id, game=other_game)
+
+            page = await room_service.get_available_rooms(status=GameRoomStatus.FINISHED.value)
+            assert 2 == len(page["results"])
+            page = await room_service.get_available_rooms(game_id=str(other_game.id))
+            assert 1 == len(page["results"])
+            page = await room_service.get_available_rooms(status=None)
+            assert 4 == len(page["results"])
+
+        asyncio.run(run_with_db(run))
+
+    def test_invalid_cursor(self) -> None:
+        """Tests invalid cursor is rejected"""
+
+        async def run() -> None:
+            with pytest.raises(APIError):
+                await room_service.get_available_rooms(cursor="invalid")
+
+        asyncio.run(run_with_db(run))
+
+    def test_open_rooms_cache_invalidated(self) -> None:
+        """Tests cached open rooms page is refreshed when room is joined"""
+
+        async def run() -> None:
+            room = (await create_rooms(1))[0]
+            page = await room_service.get_available_rooms()
+            assert [] == page["results"][0]["participants"]
+
+            player = await Player.create(email="p2@test.com", name="p2", password="-")
+            await room_service.join_room(str(room.id), player)
+
+            page = await room_service.get_available_rooms()
+            assert 1 == len(page["results"][0]["participants"])
+
+        asyncio.run(run_with_db(run))
+
+
+class TestRoomDetails:
+    """Test cases for room details"""
+
+    def test_fixed_number_of_queries(self) -> None:
+        """Tests room is loaded with one join and one query of participants"""
+
+        async def run() -> None:
+            room = (await create_rooms(1))[0]
+            for index in range(3):
+                player = await Player.create(
+                    email=f"{index}@test.com", name=f"{index}", password="-"
+                )
+                await room.participants.add(player)
+
+            with QueryCounter() as counter:
+                data = await room_service.get_room_by_id(str(room.id))
+            assert 2 == len(counter.queries)
+
+            # the same output as of pydantic serializer
+            await room.fetch_related("admin", "game", "participants")
+            expected = (await RoomSerializer.from_tortoise_orm(room)).model_dump(mode="json")
+            key = lambda player: player["id"]
+            data["participants"].sort(key=key)
+            expected["participants"].sort(key=key)
+            assert expected == data
+
+        asyncio.run(run_with_db(run))
+
+
+class TestRoomUpdate:
+    """Test cases for room update"""
+
+    def test_started_room_not_restarted(self, monkeypatch) -> None:
+        """Tests game of the started room is not set up again"""
+        monkeypatch.setattr(
+            loaders, "options", types.SimpleNamespace(game_turn_checkpoint_interval=10)
+        )
+
+        async def run() -> None:
+            admin = await Player.create(email="p1@test.com", name="p1", password="-")
+            game = await Game.create(name="TicTacToe", min_size=2, max_size=2)
+            room = await Room.create(admin=admin, game=game, size=1)
+            await room.participants.add(admin)
+            engine_registry.discover()
+            await engine_registry.load_games()
+
+            started = GameRoomStatus.STARTED.value
+            data = await room_service.update_room(str(room.id), admin, dict(status=started))
+            assert started == data["status"]
+            with pytest.raises(APIError) as error:
+                await room_service.update_room(str(room.id), admin, dict(status=started))
+            assert 400 == error.value.status_code
+            assert 1 == await GameTurn.filter(room_id=room.id).count()
+
+        try:
+            asyncio.run(run_with_db(run))
+        finally:
+            game_state_cache.clear()
+
+
+class TestLegalMoves:
+    """Test cases for legal moves of the room game"""
+
+    def test_legal_moves(self, monkeypatch) -> None:
+        """Tests only active player has legal moves"""
+        monkeypatch.setattr(
+            loaders, "options", types.SimpleNamespace(game_turn_checkpoint_interval=10)
+        )
+
+        async def run() -> None:
+            admin = await Player.create(email="p1@test.com", name="p1", password="-")
+            player = await Player.create(email="p2@test.com", name="p2", password="-")
+            game = await Game.create(name="Regicide", min_size=1, max_size=4)
+            room = await Room.create(admin=admin, game=game, size=2)
+            engine_registry.discover()
+            await engine_registry.load_games()
+            engine = await get_engine(room)
+            await engine.setup([str(admin.id), str(player.id)])
+
+            moves = {
+                str(user.id): await game_room_service.get_legal_moves(str(room.id), str(user.id))
+                for user in (admin, player)
+            }
+            # one of players makes the first turn
+            assert sorted(map(bool, moves.values())) == [False, True]
+            assert {"cards": []} in max(moves.values(), key=len)
+
+        try:
+            asyncio.run(run_with_db(run))
+        finally:
+            game_state_cache.clear()
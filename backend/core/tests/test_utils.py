@@ -0,0 +1,75 @@
+"""Tests for DTO codec"""
+import dataclasses
+
+from core.games.regicide.dto import GameTurnDataDto, PlayerHand
+from core.games.regicide.game import Regicide
+from core.games.regicide.serializers import (
+    RegicideGameStateDataSerializer,
+    RegicideGameTurnDataSerializer,
+)
+from core.games.tictactoe.dto import GameStateDto as TicTacToeGameStateDto
+from core.resources import encoders
+
+
+def get_turn_dto() -> GameTurnDataDto:
+    """Get turn DTO with nested DTOs"""
+    return GameTurnDataDto(
+        enemy_deck_size=11,
+        discard_size=0,
+        enemy=("J", "♠"),
+        enemy_state=(20, 10),
+        active_player_id="user1",
+        player_id="user1",
+        played_combos=[[("2", "♣"), ("2", "♥")]],
+        status="playing_cards",
+        tavern_size=30,
+        turn=2,
+        hands=[PlayerHand(id="user1", size=1, hand=[("A", "♦")]), PlayerHand(id="user2", size=7)],
+    )
+
+
+class TestSerializable:
+    """Test cases for DTO codec"""
+
+    def test_asdict(self) -> None:
+        """Tests DTO is dumped the same way as by dataclasses without copying containers"""
+        dto = get_turn_dto()
+        data = dto.asdict()
+        expected = dataclasses.asdict(dto)
+        for item in (expected, *expected["hands"]):
+            item.pop("not_serializing")
+        assert data == expected
+        assert data["played_combos"] is dto.played_combos
+        assert data["hands"][0] == {"id": "user1", "size": 1, "hand": [("A", "♦")]}
+
+    def test_not_serializing(self) -> None:
+        """Tests excluded fields aren't dumped"""
+        dto = TicTacToeGameStateDto(
+            active_player_id="user1",
+            players=["user1", "user2"],
+            board=[None] * 9,
+            status="in_progress",
+            turn=1,
+            not_serializing=("board",),
+        )
+        assert "board" not in dto.asdict()
+        assert "not_serializing" not in dto.asdict()
+
+    def test_serialize_round_trip(self, monkeypatch) -> None:
+        """Tests DTO survives serialization with any JSON backend"""
+        dto = get_turn_dto()
+        for name in encoders.BACKENDS:
+            monkeypatch.setattr(encoders, "json_backend", encoders.BACKENDS[name]())
+            loaded = GameTurnDataDto.deserialize(dto.serialize())
+            assert loaded.enemy == ["J", "♠"]
+            assert loaded.hands[1] == {"id": "user2", "size": 7, "hand": None}
+
+    def test_game_serializers(self) -> None:
+        """Tests game serializers output is JSON serializable"""
+        game = Regicide.init_new_game(["user1", "user2"])
+        state = RegicideGameStateDataSerializer.dumps(game)
+        turn = RegicideGameTurnDataSerializer.dumps(game, player_id="user1")
+        assert (
+            encoders.json_loads(encoders.json_dumps(state))["players"][0][0] == game.players[0].id
+        )
+        assert turn["hands"][0]["size"] == len(game.players[0].hand)
@@ -0,0 +1,263 @@
+"""Unit tests for websocket manager"""
+import asyncio
+import json
+
+from typing import Any, Dict, List
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from core.websocket import (
+    RedisPubSubManager,
+    WebSocketManager,
+    encode_state_views,
+    get_socket_message_builder,
+)
+
+
+class Socket:
+    """Connected socket stub"""
+
+    def __init__(self, user_id: str | None = None) -> None:
+        self.user_id = user_id
+        self.messages: List[str] = []
+        self.close_code: int | None = None
+
+    async def write_message(self, message: str) -> None:
+        self.messages.append(message)
+
+    def close(self, code: int | None = None, reason: str | None = None) -> None:
+        self.close_code = code
+
+
+class SlowSocket(Socket):
+    """Connected socket stub which never flushes messages"""
+
+    async def write_message(self, message: str) -> None:
+        self.messages.append(message)
+        await asyncio.Event().wait()
+
+
+class PubSub:
+    """Redis pub/sub connection stub"""
+
+    def __init__(self) -> None:
+        self.channels: List[str] = []
+        self.queue: asyncio.Queue = asyncio.Queue()
+        # error raised by the next read
+        self.error: Exception | None = None
+
+    async def subscribe(self, *channels: str) -> None:
+        self.channels.extend(channels)
+
+    async def unsubscribe(self, channel: str) -> None:
+        self.channels.remove(channel)
+
+    async def get_message(self, **kwargs: Any) -> Dict[str, Any] | None:
+        if self.error:
+            error, self.error = self.error, None
+            raise error
+        return await self.queue.get()
+
+    async def reset(self) -> None:
+        self.channels = []
+
+    def put(self, channel: str, data: str) -> None:
+        self.queue.put_nowait(
+            {"type": "message", "channel": channel.encode(), "data": data.encode()}
+        )
+
+
+class Redis:
+    """Redis connection stub"""
+
+    def __init__(self) -> None:
+        self.pubsub_connections: List[PubSub] = []
+
+    def pubsub(self) -> PubSub:
+        self.pubsub_connections.append(PubSub())
+        return self.pubsub_connections[-1]
+
+    async def publish(self, channel: str, message: str) -> None:
+        for connection in self.pubsub_connections:
+            if channel in connection.channels:
+                connection.put(channel, message)
+
+
+class RedisPubSubManagerStub(RedisPubSubManager):
+    """Pub/sub manager with Redis stub"""
+
+    async def _get_redis_connection(self) -> Any:
+        return Redis()
+
+
+class TestSocketMessages:
+    """Test cases for messages sent to room sockets"""
+
+    def test_plain_message(self) -> None:
+        """Tests plain message sent as is"""
+        build_message = get_socket_message_builder("refresh")
+
+        assert "refresh" == build_message(Socket("user1"))
+        assert "refresh" == build_message(Socket())
+
+    def test_state_views(self) -> None:
+        """Tests every socket receives own game state view"""
+        views = {
+            "": {"hand": None},
+            "user1": {"hand": [("2", "♣")]},
+            "user2": {"hand": [("5", "♥")]},
+        }
+        build_message = get_socket_message_builder(encode_state_views(views))
+
+        assert {"type": "state", "data": {"hand": [["2", "♣"]]}} == json.loads(
+            build_message(Socket("user1"))
+        )
+        assert {"type": "state", "data": {"hand": [["5", "♥"]]}} == json.loads(
+            build_message(Socket("user2"))
+        )
+        # spectators and unknown players see public view
+        for socket in (Socket(), Socket("user3")):
+            assert {"type": "state", "data": {"hand": None}} == json.loads(build_message(socket))
+
+
+class TestRoomFanOut:
+    """Test cases for room messages fan-out"""
+
+    def test_single_reader_dispatches_rooms(self) -> None:
+        """Tests messages of all rooms are read by single reader and sent to room sockets"""
+        pubsub = RedisPubSubManagerStub("localhost", 6379)
+        manager = WebSocketManager(pubsub)
+        room1 = [Socket("user1"), Socket("user2")]
+        room2 = [Socket("user3")]
+
+        async def run() -> None:
+            for socket in room1:
+                await manager.add_user_to_room("room1", socket)
+            for socket in room2:
+                await manager.add_user_to_room("room2", socket)
+            reader = pubsub.reader
+            await manager.broadcast_to_room("room1", "refresh")
+            await manager.broadcast_to_room("room2", "update")
+            await asyncio.sleep(0.01)
+            assert reader is pubsub.reader
+            reader.cancel()
+
+        asyncio.run(run())
+        assert ["room1", "room2"] == pubsub.pubsub.channels
+        assert all(["refresh"] == socket.messages for socket in room1)
+        assert ["update"] == room2[0].messages
+
+    def test_reader_reconnects(self) -> None:
+        """Tests reader survives lost connection and delivers messages after reconnect"""
+        pubsub = RedisPubSubManagerStub("localhost", 6379, reconnect_delay=0.01)
+        manager = WebSocketManager(pubsub)
+        socket = Socket("user1")
+
+        async def run() -> None:
+            await pubsub.connect()
+            broken = pubsub.pubsub
+            broken.error = RedisConnectionError("Connection closed by server.")
+            await manager.add_user_to_room("room1", socket)
+            await asyncio.sleep(0.05)
+            await manager.broadcast_to_room("room1", "refresh")
+            await asyncio.sleep(0.01)
+            assert not pubsub.reader.done()
+            assert broken is not pubsub.pubsub
+            assert [] == broken.channels
+            pubsub.reader.cancel()
+
+        asyncio.run(run())
+        assert ["room1"] == pubsub.pubsub.channels
+        assert ["refresh"] == socket.messages
+
+    def test_slow_client_evicted(self) -> None:
+        """Tests slow client doesn't delay others and is disconnected when falls behind"""
+        pubsub = RedisPubSubManagerStub("localhost", 6379)
+        manager = WebSocketManager(pubsub, send_queue_size=2)
+        fast, slow = Socket("user1"), SlowSocket("user2")
+
+        async def run() -> None:
+            await manager.add_user_to_room("room1", fast)
+            await manager.add_user_to_room("room1", slow)
+            for index in range(4):
+                await manager.broadcast_to_room("room1", f"message{index}")
+                await asyncio.sleep(0.01)
+            pubsub.reader.cancel()
+
+        asyncio.run(run())
+        assert ["message0", "message1", "message2", "message3"] == fast.messages
+        # first message is being written, two are pending, the next one overflows queue
+        assert ["message0"] == slow.messages
+        assert 1013 == slow.close_code
+        assert [fast] == manager.rooms["room1"]
+        assert slow not in manager.senders
+
+    def test_sweeper_removes_empty_rooms(self) -> None:
+        """Tests empty rooms are unsubscribed in background"""
+        pubsub = RedisPubSubManagerStub("localhost", 6379)
+        manager = WebSocketManager(pubsub)
+        socket1, socket2 = Socket("user1"), Socket("user2")
+
+        async def run() -> None:
+            manager.start_sweeper(0.01)
+            await manager.add_user_to_room("room1", socket1)
+            await manager.add_user_to_room("room2", socket2)
+            await manager.remove_user_from_room("room1", socket1)
+            await asyncio.sleep(0.05)
+            manager.sweeper.cancel()
+            pubsub.reader.cancel()
+
+        asyncio.run(run())
+        assert {"room2": [socket2]} == manager.rooms
+        assert ["room2"] == pubsub.pubsub.channels
+        assert ["room2"] == list(pubsub.handlers)
+
+    def test_join_during_sweep(self) -> None:
+        """Tests socket joining room which is being swept stays subscribed"""
+        pubsub = RedisPubSubManagerStub("localhost", 6379)
+        manager = WebSocketManager(pubsub)
+        socket1, socket2, socket3 = Socket("user1"), Socket("user2"), Socket("user3")
+
+        async def run() -> None:
+            for room_id, socket in (("room1", socket1), ("room2", socket2)):
+                await manager.add_user_to_room(room_id, socket)
+                await manager.remove_user_from_room(room_id, socket)
+            unsubscribe = pubsub.pubsub.unsubscribe
+
+            async def slow_unsubscribe(channel: str) -> None:
+                # let other coroutines run while channel is being unsubscribed
+                await asyncio.sleep(0)
+                await unsubscribe(channel)
+
+            pubsub.pubsub.unsubscribe = slow_unsubscribe
+            cleanup = asyncio.create_task(manager._cleanup_rooms())
+            await asyncio.sleep(0)
+            await manager.add_user_to_room("room2", socket3)
+            await cleanup
+            await manager.broadcast_to_room("room2", "refresh")
+            await asyncio.sleep(0.01)
+            pubsub.reader.cancel()
+
+        asyncio.run(run())
+        assert {"room2": [socket3]} == manager.rooms
+        assert ["room2"] == pubsub.pubsub.channels
+        assert ["refresh"] == socket3.messages
+
+    def test_close_all_flushes_messages(self) -> None:
+        """Tests pending messages are sent before sockets are closed on shutdown"""
+        pubsub = RedisPubSubManagerStub("localhost", 6379)
+        manager = WebSocketManager(pubsub)
+        fast, slow = Socket("user1"), SlowSocket("user2")
+
+        async def run() -> None:
+            await manager.add_user_to_room("room1", fast)
+            await manager.add_user_to_room("room1", slow)
+            await manager.broadcast_to_room("room1", "refresh")
+            await asyncio.sleep(0.01)
+            await manager.close_all(timeout=0.01)
+            pubsub.reader.cancel()
+
+        asyncio.run(run())
+        assert ["refresh"] == fast.messages
+        assert 1001 == fast.close_code
+        assert 1001 == slow.close_code
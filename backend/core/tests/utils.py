@@ -0,0 +1,42 @@
+"""Test utilities"""
+from typing import Any, Awaitable, Callable, List
+
+from tortoise import Tortoise, connections
+
+
+async def run_with_db(func: Callable[[], Awaitable[Any]]) -> Any:
+    """Run coroutine function against in-memory database"""
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["core.resources.models"]})
+    await Tortoise.generate_schemas()
+    try:
+        return await func()
+    finally:
+        await Tortoise.close_connections()
+
+
+class QueryCounter:
+    """Counts queries executed via default connection"""
+
+    METHODS = ("execute_query", "execute_query_dict", "execute_insert", "execute_many")
+
+    def __init__(self) -> None:
+        self.queries: List[str] = []
+
+    def __enter__(self) -> "QueryCounter":
+        client = connections.get("default")
+        for method in self.METHODS:
+            setattr(client, method, self._wrap(getattr(client, method)))
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        client = connections.get("default")
+        for method in self.METHODS:
+            # drop instance attribute, class method is used again
+            delattr(client, method)
+
+    def _wrap(self, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        async def wrapper(query: str, *args: Any, **kwargs: Any) -> Any:
+            self.queries.append(query)
+            return await func(query, *args, **kwargs)
+
+        return wrapper
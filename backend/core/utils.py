@@ -1,32 +1,61 @@
 """Utilities"""
-import json
+from dataclasses import dataclass, fields
+from functools import cache
+from typing import Any, FrozenSet, Tuple
 
-from dataclasses import asdict, dataclass, fields
-from typing import Tuple
+from core.resources.encoders import json_dumps, json_loads
 
 
 @dataclass(kw_only=True, frozen=True)
 class Serializable:
+    """
+    Base class of DTOs.
+
+    DTOs are dumped into plain dicts straight from the list of fields, unlike `dataclasses.asdict`
+    containers aren't deep-copied: values are shared with DTO, nested DTOs are dumped to dicts.
+    """
+
     not_serializing: Tuple = tuple()
 
     @classmethod
     def fromdict(cls, d):
         if d is None:
             return None
-        keys = {f.name for f in fields(cls)}
-        d = {k: v for k, v in d.items() if k in keys}
-        return cls(**d)
+        keys = _field_names_set(cls)
+        return cls(**{k: v for k, v in d.items() if k in keys})
 
     def asdict(self):
-        d = asdict(self)
-        for field in self.not_serializing:
-            d.pop(field, None)
-        d.pop("not_serializing", None)
-        return d
+        skip = self.not_serializing
+        return {
+            name: _dump_value(getattr(self, name))
+            for name in _field_names(type(self))
+            if name not in skip
+        }
 
     @classmethod
     def deserialize(cls, line):
-        return cls.fromdict(json.loads(line))
+        return cls.fromdict(json_loads(line))
 
     def serialize(self):
-        return json.dumps(self.asdict(), ensure_ascii=False)
+        return json_dumps(self.asdict())
+
+
+@cache
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Names of DTO fields to dump"""
+    return tuple(f.name for f in fields(cls) if f.name != "not_serializing")
+
+
+@cache
+def _field_names_set(cls: type) -> FrozenSet[str]:
+    """Names of all DTO fields"""
+    return frozenset(f.name for f in fields(cls))
+
+
+def _dump_value(value: Any) -> Any:
+    """Dump nested DTOs, lists of DTOs are expected to contain only DTOs"""
+    if isinstance(value, Serializable):
+        return value.asdict()
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], Serializable):
+        return [item.asdict() for item in value]
+    return value
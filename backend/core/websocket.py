@@ -1,24 +1,89 @@
 import asyncio
+import logging
+
+from typing import Any, Awaitable, Callable, Dict
 
 import redis.asyncio as aioredis
 
+from redis.exceptions import (
+    ConnectionError as RedisConnectionError,
+    TimeoutError as RedisTimeoutError,
+)
 from tornado.websocket import WebSocketClosedError
 
+from core.metrics import metrics
+from core.resources.encoders import json_dumps, json_loads
+
+log = logging.getLogger(__name__)
+
+# handler of pub/sub channel messages, called with channel name and message data
+ChannelHandler = Callable[[str, str], Awaitable[None]]
+
+# errors of lost Redis connection, pub/sub reader reconnects on them
+REDIS_CONNECTION_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError)
+
+# type of the message with personalized game state views
+STATE_MESSAGE_TYPE = "state"
+
+
+def encode_state_views(views: Dict[str, Any]) -> str:
+    """
+    Encode game state views into pub/sub message.
+
+    Every view is encoded once into websocket message, so readers just pick message for socket.
+    """
+    messages = {
+        player_id: json_dumps({"type": STATE_MESSAGE_TYPE, "data": view})
+        for player_id, view in views.items()
+    }
+    return json_dumps({"type": STATE_MESSAGE_TYPE, "views": messages})
+
+
+def get_socket_message_builder(data: str) -> Callable[[Any], str]:
+    """Get function which returns message for the socket"""
+    if not data.startswith("{"):
+        return lambda socket: data
+    payload = json_loads(data)
+    if payload.get("type") != STATE_MESSAGE_TYPE:
+        return lambda socket: data
+    views = payload["views"]
+    # spectators and players without own view receive public view
+    return lambda socket: views.get(getattr(socket, "user_id", None) or "", views[""])
+
 
 class RedisPubSubManager:
     """
         Initializes the RedisPubSubManager.
 
+    Worker keeps single pub/sub connection, messages of all subscribed channels are read by one
+    reader task and dispatched to channel handlers. If connection is lost, the reader reconnects
+    with exponential backoff and subscribes all channels again.
+
     Args:
         host (str): Redis server host.
         port (int): Redis server port.
+        read_timeout (float): Max seconds the reader waits for a message (None - forever).
+        reconnect_delay (float): Seconds to wait before the first reconnect attempt.
+        max_reconnect_delay (float): Max seconds between reconnect attempts.
     """
 
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        read_timeout: float | None = 1.0,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
         self.redis_host = host
         self.redis_port = port
-        self.pubsub = None
-        self.redis_connection = None
+        self.read_timeout = read_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.pubsub: Any = None
+        self.redis_connection: Any = None
+        self.handlers: Dict[str, ChannelHandler] = {}
+        self.reader: asyncio.Task | None = None
 
     async def _get_redis_connection(self) -> aioredis.Redis:
         """
@@ -33,60 +98,169 @@ class RedisPubSubManager:
 
     async def connect(self) -> None:
         """
-        Connects to the Redis server and initializes the pubsub client.
+        Connects to the Redis server and initializes the pubsub client, if not connected yet.
         """
+        if self.redis_connection:
+            return
         self.redis_connection = await self._get_redis_connection()
         self.pubsub = self.redis_connection.pubsub()
 
-    async def _publish(self, room_id: str, message: str) -> None:
+    async def publish(self, channel: str, message: str) -> None:
         """
         Publishes a message to a specific Redis channel.
 
         Args:
-            room_id (str): Channel or room ID.
+            channel (str): Channel or room ID.
             message (str): Message to be published.
         """
-        if not self.redis_connection:
-            self.connect()
-        await self.redis_connection.publish(room_id, message)
+        await self.connect()
+        await self.redis_connection.publish(channel, message)
 
-    async def subscribe(self, room_id: str) -> aioredis.Redis:
+    async def subscribe(self, channel: str, handler: ChannelHandler) -> None:
         """
         Subscribes to a Redis channel.
 
         Args:
-            room_id (str): Channel or room ID to subscribe to.
-
-        Returns:
-            aioredis.ChannelSubscribe: PubSub object for the subscribed channel.
+            channel (str): Channel or room ID to subscribe to.
+            handler (ChannelHandler): Coroutine function called with channel and message data.
         """
-        await self.pubsub.subscribe(room_id)
-        return self.pubsub
+        await self.connect()
+        self.handlers[channel] = handler
+        await self.pubsub.subscribe(channel)
+        if not self.reader or self.reader.done():
+            self.reader = asyncio.create_task(self._read_messages())
 
-    async def unsubscribe(self, room_id: str) -> None:
+    async def unsubscribe(self, channel: str) -> None:
         """
         Unsubscribes from a Redis channel.
 
         Args:
-            room_id (str): Channel or room ID to unsubscribe from.
+            channel (str): Channel or room ID to unsubscribe from.
+        """
+        self.handlers.pop(channel, None)
+        await self.pubsub.unsubscribe(channel)
+
+    async def _reconnect(self) -> None:
         """
-        await self.pubsub.unsubscribe(room_id)
+        Replaces broken pubsub client with new one and subscribes it to all handled channels.
+
+        Attempts are repeated with exponential backoff until connection is restored.
+        """
+        delay = self.reconnect_delay
+        while True:
+            log.warning("Redis pub/sub connection lost, reconnect in %.1fs", delay)
+            await asyncio.sleep(delay)
+            broken, self.pubsub = self.pubsub, self.redis_connection.pubsub()
+            try:
+                await broken.reset()
+            except Exception:
+                log.debug("Can't close broken pubsub connection", exc_info=True)
+            try:
+                if self.handlers:
+                    await self.pubsub.subscribe(*self.handlers)
+                return
+            except REDIS_CONNECTION_ERRORS:
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _read_messages(self) -> None:
+        """
+        Reads messages of all subscribed channels and dispatches them to channel handlers.
+        """
+        wakeups = metrics.meter("pubsub.reader.wakeups")
+        while True:
+            try:
+                # block on the socket until message arrives or timeout is over
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=self.read_timeout
+                )
+            except REDIS_CONNECTION_ERRORS:
+                metrics.meter("pubsub.reader.reconnects").mark()
+                await self._reconnect()
+                continue
+            wakeups.mark()
+            if message is None:
+                continue
+            channel = message["channel"].decode("utf-8")
+            handler = self.handlers.get(channel)
+            if not handler:
+                continue
+            try:
+                await handler(channel, message["data"].decode("utf-8"))
+            except Exception:
+                log.exception("Can't handle message of channel (%s)", channel)
+
+
+class SocketSender:
+    """
+    Sends messages to websocket one by one from bounded queue.
+
+    Messages are enqueued without waiting for the socket, so slow socket doesn't delay others.
+    Socket which has `high_water_mark` messages pending has fallen behind and can't accept more.
+
+    Args:
+        socket (WebSocket): WebSocket connection object.
+        high_water_mark (int): Max number of pending messages.
+    """
+
+    def __init__(self, socket, high_water_mark: int = 64) -> None:
+        self.socket = socket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=high_water_mark)
+        self.task = asyncio.create_task(self._send_messages())
+
+    @property
+    def closed(self) -> bool:
+        """True if socket has been closed"""
+        return self.task.done()
+
+    def send(self, message: str) -> bool:
+        """
+        Enqueues message to be sent.
+
+        Returns:
+            bool: False if socket is closed or has too many pending messages.
+        """
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def stop(self) -> None:
+        """Stops sending messages"""
+        self.task.cancel()
+
+    async def _send_messages(self) -> None:
+        """Writes enqueued messages, waits until every message is flushed to the socket"""
+        while True:
+            message = await self.queue.get()
+            try:
+                await self.socket.write_message(message)
+            except WebSocketClosedError:
+                return
+            finally:
+                self.queue.task_done()
 
 
 class WebSocketManager:
     """Websocket manager"""
 
-    def __init__(self, pubsub_client) -> None:
+    def __init__(self, pubsub_client, send_queue_size: int = 64) -> None:
         """
         Initializes the WebSocketManager.
 
         Attributes:
             rooms (dict): A dictionary to store WebSocket connections in different rooms.
             pubsub_client (RedisPubSubManager): An instance of the RedisPubSubManager class for pub-sub functionality.
+            send_queue_size (int): Max number of pending messages per connection, slower clients are disconnected.
         """
         self.rooms: dict = {}
+        self.senders: Dict[Any, SocketSender] = {}
         self.lock = asyncio.Lock()
         self.pubsub_client = pubsub_client
+        self.send_queue_size = send_queue_size
+        self.sweeper: asyncio.Task | None = None
 
     async def add_user_to_room(self, room_id: str, websocket) -> None:
         """
@@ -96,14 +270,17 @@ class WebSocketManager:
             room_id (str): Room ID or channel name.
             websocket (WebSocket): WebSocket connection object.
         """
+        self.senders[websocket] = SocketSender(websocket, self.send_queue_size)
         if room_id in self.rooms:
             self.rooms[room_id].append(websocket)
-        else:
-            self.rooms[room_id] = [websocket]
-
-            await self.pubsub_client.connect()
-            pubsub_subscriber = await self.pubsub_client.subscribe(room_id)
-            asyncio.create_task(self._pubsub_data_reader(pubsub_subscriber, room_id))
+            return
+        # room could be unsubscribed by sweeper right now
+        async with self.lock:
+            if room_id in self.rooms:
+                self.rooms[room_id].append(websocket)
+            else:
+                self.rooms[room_id] = [websocket]
+                await self.pubsub_client.subscribe(room_id, self._send_to_room)
 
     async def broadcast_to_room(self, room_id: str, message: str) -> None:
         """
@@ -113,7 +290,17 @@ class WebSocketManager:
             room_id (str): Room ID or channel name.
             message (str): Message to be broadcasted.
         """
-        await self.pubsub_client._publish(room_id, message)
+        await self.pubsub_client.publish(room_id, message)
+
+    async def push_to_room(self, room_id: str, views: Dict[str, Any]) -> None:
+        """
+        Pushes personalized game state views to all connected WebSockets in a room.
+
+        Args:
+            room_id (str): Room ID or channel name.
+            views (dict): Game state views by player id, empty key is for spectators.
+        """
+        await self.pubsub_client.publish(room_id, encode_state_views(views))
 
     async def remove_user_from_room(self, room_id: str, websocket) -> None:
         """
@@ -123,7 +310,49 @@ class WebSocketManager:
             room_id (str): Room ID or channel name.
             websocket (WebSocket): WebSocket connection object.
         """
-        self.rooms[room_id].remove(websocket)
+        if websocket in self.rooms.get(room_id, []):
+            self.rooms[room_id].remove(websocket)
+        if sender := self.senders.pop(websocket, None):
+            sender.stop()
+
+    async def close_all(self, timeout: float = 5.0) -> None:
+        """
+        Flushes pending messages and closes all connected WebSockets.
+
+        Args:
+            timeout (float): Max seconds to wait for pending messages.
+        """
+        if self.sweeper:
+            self.sweeper.cancel()
+        senders = list(self.senders.values())
+        flushes = [asyncio.create_task(sender.queue.join()) for sender in senders]
+        if flushes:
+            _, pending = await asyncio.wait(flushes, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        for sender in senders:
+            sender.socket.close(1001, "Server is shutting down")
+            sender.stop()
+
+    def start_sweeper(self, interval: float = 30.0) -> None:
+        """
+        Starts background task which periodically removes empty rooms.
+
+        Args:
+            interval (float): Seconds between cleanups.
+        """
+        self.sweeper = asyncio.create_task(self._sweep_rooms(interval))
+
+    async def _sweep_rooms(self, interval: float) -> None:
+        """
+        Cleanup rooms every interval
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._cleanup_rooms()
+            except Exception:
+                log.exception("Can't cleanup rooms")
 
     async def _cleanup_rooms(self) -> None:
         """
@@ -131,33 +360,33 @@ class WebSocketManager:
         """
         async with self.lock:
             empty_rooms = [room_id for room_id in self.rooms if not len(self.rooms[room_id])]
+            # forget rooms before the first await, so sockets joining meanwhile don't get into
+            # removed room but subscribe it again once the lock is released
             for room_id in empty_rooms:
                 del self.rooms[room_id]
+            for room_id in empty_rooms:
                 await self.pubsub_client.unsubscribe(room_id)
 
-    async def _pubsub_data_reader(self, pubsub_subscriber, orig_room_id: str) -> None:
+    async def _send_to_room(self, room_id: str, data: str) -> None:
         """
-        Reads and broadcasts messages received from Redis PubSub.
+        Sends message received from Redis PubSub to all connected WebSockets in a room.
+
+        Messages are written concurrently, clients which have fallen behind are disconnected.
 
         Args:
-            pubsub_subscriber (aioredis.ChannelSubscribe): PubSub object for the subscribed channel.
+            room_id (str): Room ID or channel name.
+            data (str): Message data.
         """
-        while orig_room_id in self.rooms:
-            message = await pubsub_subscriber.get_message(ignore_subscribe_messages=True)
-            if message is None:
-                continue
-            room_id = message["channel"].decode("utf-8")
-            # filter only messages for this channel
-            if room_id != orig_room_id:
+        build_message = get_socket_message_builder(data)
+        removable = []
+        for socket in self.rooms.get(room_id, []):
+            sender = self.senders.get(socket)
+            if sender and sender.send(build_message(socket)):
                 continue
-            data = message["data"].decode("utf-8")
-            removable = []
-            for socket in self.rooms[room_id]:
-                try:
-                    await socket.write_message(data)
-                except WebSocketClosedError:
-                    removable.append(socket)
-            for socket in removable:
-                await self.remove_user_from_room(room_id, socket)
-            # from time to time cleanup rooms
-            await self._cleanup_rooms()
+            if sender and not sender.closed:
+                log.warning("Disconnect slow websocket client of room (%s)", room_id)
+                metrics.meter("websocket.evicted").mark()
+                socket.close(1013, "Client is too slow")
+            removable.append(socket)
+        for socket in removable:
+            await self.remove_user_from_room(room_id, socket)
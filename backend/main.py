@@ -3,15 +3,28 @@ Main
 """
 import asyncio
 import os
+import signal
+import socket
+
+from typing import List
 
 from aiocache import caches
 from tornado import web
+from tornado.httpserver import HTTPServer
+from tornado.netutil import bind_sockets
 from tornado.options import options
+from tornado.process import fork_processes
+from tortoise import Tortoise
 
 from core.config import ROOT_PATH, STATIC_PATH, TEMPLATE_PATH
 from core.database import init_database
+from core.games.cache import game_state_cache
+from core.games.executor import turn_executor
 from core.handlers.routes import get_routes
+from core.loaders import engine_registry
+from core.resources.encoders import set_json_backend
 from core.resources.errors import ErrorHandler
+from core.resources.passwords import password_hasher
 from core.websocket import RedisPubSubManager, WebSocketManager
 
 
@@ -25,6 +38,8 @@ class Application(web.Application):
         self.socket_manager = socket_manager
         settings = dict(
             debug=options.debug,
+            # code reloading restarts process, it doesn't work with pre-forked workers
+            autoreload=options.debug and options.workers == 1,
             static_path=STATIC_PATH,
             template_path=TEMPLATE_PATH,
             default_handler_class=ErrorHandler,
@@ -34,16 +49,68 @@ class Application(web.Application):
         super().__init__(routes, **settings)
 
 
-async def main() -> None:
+async def main(sockets: List[socket.socket]) -> None:
     """Main loop function"""
+    # every worker process has own db pool and Redis connections
     await init_database()
+    await engine_registry.load_games()
     cache = caches.get("default")
-    pubsub = RedisPubSubManager(options.redis_host, options.redis_port)
-    socket_manager = WebSocketManager(pubsub)
+    turn_executor.retries = options.game_turn_retries
+    password_hasher.workers = options.password_workers
+    password_hasher.max_queue = options.password_queue_size
+    set_json_backend(options.json_backend)
+    # single pub/sub connection and reader shared by all subscribers of the worker
+    pubsub = RedisPubSubManager(
+        options.redis_host, options.redis_port, read_timeout=options.pubsub_read_timeout or None
+    )
+    await pubsub.connect()
+    game_state_cache.maxsize = options.game_state_cache_size
+    await game_state_cache.listen(pubsub)
+    socket_manager = WebSocketManager(pubsub, send_queue_size=options.websocket_send_queue_size)
+    socket_manager.start_sweeper(options.websocket_room_sweep_interval)
     app = Application(None, cache, socket_manager)
-    app.listen(options.port)
-    await asyncio.Event().wait()
+    server = HTTPServer(app)
+    server.add_sockets(sockets)
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopping.set)
+    await stopping.wait()
+
+    # graceful shutdown: stop accepting connections, drain websockets, finish requests
+    server.stop()
+    await socket_manager.close_all(options.shutdown_timeout)
+    try:
+        await asyncio.wait_for(server.close_all_connections(), options.shutdown_timeout)
+    except asyncio.TimeoutError:
+        pass
+    await Tortoise.close_connections()
+
+
+def forward_signals() -> None:
+    """Forward SIGTERM received by parent process to worker processes"""
+
+    def handler(signum, frame) -> None:
+        # parent is in the same process group, don't forward signal to itself again
+        signal.signal(signum, signal.SIG_IGN)
+        os.killpg(os.getpgrp(), signum)
+
+    signal.signal(signal.SIGTERM, handler)
+
+
+def run() -> None:
+    """Run server in one or several (pre-forked) processes"""
+    # fail fast if any game is broken, modules are imported once before fork
+    engine_registry.discover()
+    sockets = bind_sockets(options.port, reuse_port=options.workers > 1)
+    if options.workers > 1:
+        forward_signals()
+        # workers share listening sockets, died workers are restarted
+        fork_processes(options.workers)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    asyncio.run(main(sockets))
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
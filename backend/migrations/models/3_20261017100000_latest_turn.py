@@ -0,0 +1,22 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "room" ADD "current_turn_id" UUID;
+        ALTER TABLE "room" ADD "state_version" INT NOT NULL  DEFAULT 0;
+        CREATE INDEX IF NOT EXISTS "idx_gameturn_room_id_turn" ON "gameturn" ("room_id", "turn" DESC);
+        UPDATE "room" SET "current_turn_id" = "latest"."id", "state_version" = "latest"."turn"
+        FROM (
+            SELECT DISTINCT ON ("room_id") "room_id", "id", "turn"
+            FROM "gameturn"
+            ORDER BY "room_id", "turn" DESC
+        ) AS "latest"
+        WHERE "room"."id" = "latest"."room_id";"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_gameturn_room_id_turn";
+        ALTER TABLE "room" DROP COLUMN "current_turn_id";
+        ALTER TABLE "room" DROP COLUMN "state_version";"""
@@ -0,0 +1,20 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DELETE FROM "gameturn" AS "a" USING "gameturn" AS "b"
+        WHERE "a"."room_id" = "b"."room_id" AND "a"."turn" = "b"."turn" AND "a"."id" <> "b"."id"
+            AND "a"."id" NOT IN (SELECT "current_turn_id" FROM "room" WHERE "current_turn_id" IS NOT NULL)
+            AND (
+                "b"."id" IN (SELECT "current_turn_id" FROM "room" WHERE "current_turn_id" IS NOT NULL)
+                OR "a"."id" < "b"."id"
+            );
+        DROP INDEX IF EXISTS "idx_gameturn_room_id_turn";
+        CREATE UNIQUE INDEX "uid_gameturn_room_id_turn" ON "gameturn" ("room_id", "turn" DESC);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "uid_gameturn_room_id_turn";
+        CREATE INDEX IF NOT EXISTS "idx_gameturn_room_id_turn" ON "gameturn" ("room_id", "turn" DESC);"""
@@ -2,4 +2,5 @@
 
 aerich upgrade
 
-python main.py
+# replace shell, so server receives signals of the container runtime
+exec python main.py
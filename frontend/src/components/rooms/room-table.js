@@ -6,6 +6,14 @@ import { withRouter } from "../../common/with-router";
 import wsRoom from "./room-ws";
 
 
+function parseWsMessage(value) {
+    try {
+        return JSON.parse(value);
+    } catch (e) {
+        return null;
+    }
+}
+
 class RoomTable extends Component {
     constructor(props) {
         super(props);
@@ -60,8 +68,17 @@ class RoomTable extends Component {
 
     componentDidUpdate(prevProps) {
         const { wsVal, wsTimeStamp } = this.props;
-        if (wsVal === "refresh" && prevProps.wsTimeStamp !== wsTimeStamp) {
+        if (prevProps.wsTimeStamp === wsTimeStamp) {
+            return;
+        }
+        if (wsVal === "refresh") {
             this.fetchRoomData();
+            return;
+        }
+        const message = parseWsMessage(wsVal);
+        if (message?.type === "state") {
+            // server pushed new game state
+            this.setState({data: message.data});
         }
     }
 
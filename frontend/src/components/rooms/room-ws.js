@@ -1,11 +1,16 @@
 import { useWs } from "../ws";
+import AuthService from "../../services/auth.service";
 
 
 export default function wsRoom(WrappedComponent) {
 
     return function(props) {
         const { room_id } = props.router.params;
-        const [ready, val, timeStamp, send] = useWs(`${process.env.REACT_APP_WS_SERVER_ROOT}/rooms/${room_id}/ws`);
+        // token lets server push game state personalized for the player, it's sent in the first
+        // message rather than in URL, which gets into access logs
+        const user = AuthService.getCurrentUser();
+        const authMessage = user?.token ? JSON.stringify({type: "auth", token: user.token}) : null;
+        const [ready, val, timeStamp, send] = useWs(`${process.env.REACT_APP_WS_SERVER_ROOT}/rooms/${room_id}/ws`, authMessage);
         return (
             <WrappedComponent {...props} wsVal={val} wsTimeStamp={timeStamp} wsSend={send} wsReady={ready} />
         );
@@ -1,6 +1,7 @@
 import { useState, useRef, useEffect } from "react";
 
-export const useWs = (url) => {
+// `openMessage` is sent as soon as connection is opened
+export const useWs = (url, openMessage = null) => {
     const [isReady, setIsReady] = useState(false);
     const [val, setVal] = useState(null);
     const [timeStamp, setTimeStamp] = useState(null);
@@ -12,7 +13,12 @@ export const useWs = (url) => {
     useEffect(() => {
         const socket = new WebSocket(url);
     
-        socket.onopen = () => setIsReady(true);
+        socket.onopen = () => {
+            if (openMessage) {
+                socket.send(openMessage);
+            }
+            setIsReady(true);
+        };
         socket.onclose = () => setIsReady(false);
         socket.onmessage = (event) => {
             setVal(event.data);
@@ -24,7 +30,7 @@ export const useWs = (url) => {
         return () => {
             socket.close();
         }
-    }, [url]);
+    }, [url, openMessage]);
   
     // bind is needed to make sure `send` references correct `this`
     return [isReady, val, timeStamp, ws.current?.send.bind(ws.current)]